@@ -0,0 +1,252 @@
+# app/ai/circuit_breaker.py
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from app.ai.rate_limiter import StreamFn
+from app.core.ai_config import ai_settings
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LLMUnavailableError(Exception):
+    """The LLM cannot be used right now; callers should fall back"""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Raised without calling the LLM while the circuit is open"""
+
+
+class LLMTimeoutError(LLMUnavailableError):
+    """Raised when an LLM call exceeds the configured timeout"""
+
+
+class CircuitBreaker:
+    """Circuit breaker around LLM calls.
+
+    After ``failure_threshold`` consecutive failures (errors or timeouts) the
+    circuit opens and calls fail immediately with CircuitOpenError. Once
+    ``recovery_seconds`` have passed a single trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self.failure_threshold = (
+            failure_threshold or ai_settings.AI_BREAKER_FAILURE_THRESHOLD
+        )
+        self.recovery_seconds = (
+            recovery_seconds or ai_settings.AI_BREAKER_RECOVERY_SECONDS
+        )
+        self.timeout_seconds = timeout_seconds or ai_settings.AI_TIMEOUT_SECONDS
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._metrics = {"calls": 0, "failures": 0, "timeouts": 0, "rejected": 0}
+
+    def allow(self) -> None:
+        """
+        Raise CircuitOpenError if a call would be rejected right now, without
+        reserving anything: a cheap check before queueing for the LLM
+        """
+        with self._lock:
+            recovering = time.monotonic() - self._opened_at < self.recovery_seconds
+            if (self.state == OPEN and recovering) or (
+                self.state == HALF_OPEN and self._trial_in_flight
+            ):
+                self._metrics["rejected"] += 1
+                raise CircuitOpenError(f"LLM circuit breaker is {self.state}")
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call is currently allowed"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_seconds:
+                    self._metrics["rejected"] += 1
+                    raise CircuitOpenError("LLM circuit breaker is open")
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self._metrics["rejected"] += 1
+                    raise CircuitOpenError("LLM circuit breaker is half-open")
+                self._trial_in_flight = True
+
+            self._metrics["calls"] += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        Settle a call that was cancelled before it succeeded or failed. It
+        says nothing about the LLM, so only the half-open trial slot is freed
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self, timed_out: bool = False) -> None:
+        with self._lock:
+            self._metrics["failures"] += 1
+            if timed_out:
+                self._metrics["timeouts"] += 1
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if (
+                self.state == HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def wrap(self, runnable: Runnable) -> Runnable:
+        """
+        Return a runnable guarded by this breaker and its timeout. Wrap the
+        provider call directly: anything inside counts towards the timeout
+        """
+
+        def invoke(prompt: Any, config: RunnableConfig) -> Any:
+            # Sync calls rely on the LLM client's own timeout
+            self.before_call()
+            try:
+                result = runnable.invoke(prompt, config)
+            except Exception:
+                self.record_failure()
+                raise
+            except BaseException:
+                self.release_trial()
+                raise
+            self.record_success()
+            return result
+
+        async def ainvoke(prompt: Any, config: RunnableConfig) -> Any:
+            self.before_call()
+            try:
+                result = await asyncio.wait_for(
+                    runnable.ainvoke(prompt, config), timeout=self.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                self.record_failure(timed_out=True)
+                raise LLMTimeoutError(
+                    f"LLM call timed out after {self.timeout_seconds}s"
+                )
+            except Exception:
+                self.record_failure()
+                raise
+            except BaseException:
+                # Cancelled (client disconnect, shutdown)
+                self.release_trial()
+                raise
+            self.record_success()
+            return result
+
+        return RunnableLambda(invoke, afunc=ainvoke, name="circuit_breaker")
+
+    def reject_while_open(self, runnable: Runnable) -> Runnable:
+        """
+        Return a runnable that fails fast with CircuitOpenError while the
+        circuit rejects calls, before any rate limiter wrapped inside it
+        """
+
+        def invoke(prompt: Any, config: RunnableConfig) -> Any:
+            self.allow()
+            return runnable.invoke(prompt, config)
+
+        async def ainvoke(prompt: Any, config: RunnableConfig) -> Any:
+            self.allow()
+            return await runnable.ainvoke(prompt, config)
+
+        return RunnableLambda(invoke, afunc=ainvoke, name="circuit_breaker_check")
+
+    def reject_stream_while_open(self, stream_fn: StreamFn) -> StreamFn:
+        """Like reject_while_open, for a ``stream_fn(prompt, config)``"""
+
+        async def stream(prompt: Any, config: RunnableConfig) -> AsyncIterator[Any]:
+            self.allow()
+            async for item in stream_fn(prompt, config):
+                yield item
+
+        return stream
+
+    def wrap_stream(self, stream_fn: StreamFn) -> StreamFn:
+        """
+        Like wrap, for a ``stream_fn(prompt, config)`` async iterator. The
+        timeout covers the whole stream, not each item.
+        """
+
+        async def stream(prompt: Any, config: RunnableConfig) -> AsyncIterator[Any]:
+            self.before_call()
+            deadline = time.monotonic() + self.timeout_seconds
+            iterator = stream_fn(prompt, config)
+            settled = False
+            try:
+                while True:
+                    remaining = max(0.0, deadline - time.monotonic())
+                    try:
+                        item = await asyncio.wait_for(anext(iterator), remaining)
+                    except StopAsyncIteration:
+                        break
+                    yield item
+            except asyncio.TimeoutError:
+                settled = True
+                self.record_failure(timed_out=True)
+                raise LLMTimeoutError(
+                    f"LLM stream timed out after {self.timeout_seconds}s"
+                )
+            except Exception:
+                settled = True
+                self.record_failure()
+                raise
+            except asyncio.CancelledError:
+                settled = True
+                self.release_trial()
+                raise
+            finally:
+                await iterator.aclose()
+                if not settled:
+                    # Finished, or closed early by the consumer: neither is
+                    # an LLM failure
+                    self.record_success()
+
+        return stream
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "timeout_seconds": self.timeout_seconds,
+                **self._metrics,
+            }
+
+
+_circuit_breaker: Optional[CircuitBreaker] = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """Return the shared circuit breaker, or None when it is disabled"""
+    global _circuit_breaker
+    if not ai_settings.AI_BREAKER_ENABLED:
+        return None
+    with _circuit_breaker_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker()
+        return _circuit_breaker
@@ -0,0 +1,64 @@
+# app/ai/client_pool.py
+import threading
+from itertools import cycle
+from typing import List, Optional
+
+from app.ai.langchain_service import DisputeAIService
+from app.core.ai_config import ai_settings
+
+
+class AIServicePool:
+    """Process-wide pool of pre-built DisputeAIService instances.
+
+    Each service owns its own LLM client and structured-output runnables, so
+    handing them out round-robin spreads load across a fixed set of HTTP
+    sessions instead of building a new client for every request.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = max(1, size or ai_settings.AI_POOL_SIZE)
+        self._services: List[DisputeAIService] = []
+        self._cycle = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._services)
+
+    def _start(self) -> None:
+        # Caller holds self._lock
+        if not self._services:
+            self._services = [DisputeAIService() for _ in range(self.size)]
+            self._cycle = cycle(self._services)
+        self._closed = False
+
+    def startup(self) -> None:
+        """Build the pooled services (idempotent); reopens a closed pool"""
+        with self._lock:
+            self._start()
+
+    async def shutdown(self) -> None:
+        """Close every pooled client and empty the pool until the next startup"""
+        with self._lock:
+            services, self._services, self._cycle = self._services, [], None
+            self._closed = True
+
+        for service in services:
+            await service.aclose()
+
+    def acquire(self) -> DisputeAIService:
+        """
+        Return the next pooled service, starting the pool lazily if it was
+        never started. Raises RuntimeError once the pool has been shut down.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("AI service pool is closed")
+            if not self._services:
+                self._start()
+            return next(self._cycle)
+
+
+# Shared pool used by the API routes
+ai_service_pool = AIServicePool()
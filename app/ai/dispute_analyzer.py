@@ -44,9 +44,8 @@ class DisputeAnalyzer:
             "similar_cases_count": 0,  # Placeholder for future implementation
         }
 
-    def _calculate_risk_score(
-        self, dispute_data: Dict[str, Any]
-    ) -> Tuple[float, List[str]]:
+    @staticmethod
+    def _calculate_risk_score(dispute_data: Dict[str, Any]) -> Tuple[float, List[str]]:
         """Calculate a risk score (0-100) based on dispute characteristics"""
         risk_factors = []
         score = 50
@@ -0,0 +1,207 @@
+# app/ai/fake_llm.py
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+import typing
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel, PrivateAttr
+
+from app.core.ai_config import ai_settings
+
+# GEMINI_MODEL value that selects this backend
+FAKE_MODEL = "fake"
+
+# Size of each content chunk when a response is streamed
+_STREAM_CHUNK_CHARS = 16
+
+_WORDS = [
+    "merchant",
+    "transaction",
+    "refund",
+    "chargeback",
+    "card",
+    "statement",
+    "billing",
+    "authorization",
+    "receipt",
+    "subscription",
+    "customer",
+    "verification",
+]
+
+
+class FakeDisputeLLM(BaseChatModel):
+    """Deterministic offline stand-in for the Gemini chat model.
+
+    Structured-output calls return schema-valid objects derived from a hash
+    of the prompt, so the same dispute always gets the same analysis. Each
+    call sleeps for ``latency_ms`` +/- ``jitter_ms`` and fails with
+    probability ``error_rate``, which makes it usable for load testing the
+    route, queue and database layers without network access. Streaming
+    calls return the same content in small chunks.
+
+    Latency and failures are drawn from ``seed``, the prompt and how many
+    times this instance has already seen that prompt, so a run replays
+    exactly (whatever order concurrent calls arrive in) while retries of a
+    failed prompt still get fresh draws.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+    _attempts: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _attempts_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-dispute-llm"
+
+    def with_structured_output(
+        self, schema: Type[BaseModel], *, include_raw: bool = False, **kwargs: Any
+    ) -> Runnable:
+        return self.bind(response_schema=schema) | PydanticOutputParser(
+            pydantic_object=schema
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay, fail = self._call_profile(messages)
+        time.sleep(delay)
+        return self._respond(messages, kwargs.get("response_schema"), fail)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay, fail = self._call_profile(messages)
+        await asyncio.sleep(delay)
+        return self._respond(messages, kwargs.get("response_schema"), fail)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """Stream the same response in chunks, spreading the latency across them"""
+        delay, fail = self._call_profile(messages)
+        message = self._respond(
+            messages, kwargs.get("response_schema"), fail
+        ).generations[0].message
+        content = message.content
+        pieces = [
+            content[i : i + _STREAM_CHUNK_CHARS]
+            for i in range(0, len(content), _STREAM_CHUNK_CHARS)
+        ]
+        for index, piece in enumerate(pieces):
+            await asyncio.sleep(delay / len(pieces))
+            last = index == len(pieces) - 1
+            chunk = AIMessageChunk(
+                content=piece,
+                # Usage and model name are reported once, on the final chunk
+                usage_metadata=message.usage_metadata if last else None,
+                response_metadata=message.response_metadata if last else {},
+            )
+            if run_manager:
+                await run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield ChatGenerationChunk(message=chunk)
+
+    def _digest(self, messages: List[BaseMessage]) -> Tuple[str, str]:
+        """The prompt text and its seeded hash"""
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode("utf-8")).hexdigest()
+        return prompt, digest
+
+    def _call_profile(self, messages: List[BaseMessage]):
+        """Pick this call's synthetic latency (seconds) and whether it fails"""
+        _, digest = self._digest(messages)
+        with self._attempts_lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        rng = random.Random(f"{digest}:{attempt}")
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms)
+        delay = max(0.0, self.latency_ms + jitter) / 1000
+        return delay, rng.random() < self.error_rate
+
+    def _respond(
+        self,
+        messages: List[BaseMessage],
+        schema: Optional[Type[BaseModel]],
+        fail: bool,
+    ) -> ChatResult:
+        if fail:
+            raise RuntimeError("503 Fake LLM injected failure")
+
+        prompt, digest = self._digest(messages)
+        rng = random.Random(digest)
+
+        if schema is None:
+            content = f"Fake response {digest[:12]}"
+        else:
+            content = json.dumps(_fake_payload(schema, rng))
+
+        input_tokens = len(prompt) // 4
+        output_tokens = len(content) // 4
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            # Usage callbacks only aggregate messages that name their model
+            response_metadata={"model_name": FAKE_MODEL},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def _fake_payload(schema: Type[BaseModel], rng: random.Random) -> Dict[str, Any]:
+    """Build field values that validate against the analysis schemas"""
+    payload = {}
+    for name, field in schema.model_fields.items():
+        annotation = field.annotation
+        if annotation is int:
+            # Priority levels are 1-5 throughout the API
+            payload[name] = rng.randint(1, 5)
+        elif annotation is float:
+            payload[name] = round(rng.uniform(0, 10), 1)
+        elif typing.get_origin(annotation) in (list, List):
+            payload[name] = [_fake_sentence(rng) for _ in range(rng.randint(1, 3))]
+        else:
+            payload[name] = _fake_sentence(rng)
+    return payload
+
+
+def _fake_sentence(rng: random.Random) -> str:
+    words = rng.sample(_WORDS, rng.randint(3, 6))
+    return " ".join(words).capitalize() + "."
+
+
+def build_fake_llm() -> FakeDisputeLLM:
+    """Create the fake backend from the AI_FAKE_* settings"""
+    return FakeDisputeLLM(
+        latency_ms=ai_settings.AI_FAKE_LATENCY_MS,
+        jitter_ms=ai_settings.AI_FAKE_JITTER_MS,
+        error_rate=ai_settings.AI_FAKE_ERROR_RATE,
+        seed=ai_settings.AI_FAKE_SEED,
+    )
@@ -0,0 +1,288 @@
+# app/ai/rate_limiter.py
+import asyncio
+import math
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from app.core.ai_config import ai_settings
+
+# A streaming call: ``stream_fn(prompt, config)`` returns an async iterator
+StreamFn = Callable[[Any, RunnableConfig], AsyncIterator[Any]]
+
+# How long to wait before re-checking when every concurrency slot is taken
+_SLOT_POLL_SECONDS = 0.05
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception looks like a provider quota/429 error"""
+    message = f"{type(error).__name__} {error}".lower()
+    return any(
+        marker in message
+        for marker in ("429", "resource_exhausted", "resourceexhausted", "rate limit")
+    )
+
+
+def _estimate_tokens(prompt: Any) -> int:
+    # ~4 characters per token for the prompt plus the output budget
+    return len(str(prompt)) // 4 + ai_settings.MAX_TOKENS
+
+
+def _with_handler(config: RunnableConfig, handler) -> RunnableConfig:
+    """Return a copy of config with an extra callback handler attached"""
+    callbacks = config.get("callbacks")
+    if callbacks is None:
+        callbacks = [handler]
+    elif isinstance(callbacks, list):
+        callbacks = [*callbacks, handler]
+    else:
+        callbacks = callbacks.copy()
+        callbacks.add_handler(handler, inherit=True)
+    return {**config, "callbacks": callbacks}
+
+
+def _total_tokens(handler: UsageMetadataCallbackHandler) -> int:
+    return sum(usage.get("total_tokens", 0) for usage in handler.usage_metadata.values())
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``per_minute / 60`` per second"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)"""
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+
+class AdaptiveRateLimiter:
+    """Client-side rate limiter shared by every LLM call.
+
+    Calls wait for a request token, enough TPM budget for their estimated
+    tokens and a free concurrency slot. The concurrency limit follows AIMD:
+    it grows by one slot per window of successful calls and is halved
+    whenever the provider answers with a rate-limit (429) error.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        min_concurrency: Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency or ai_settings.AI_MAX_CONCURRENCY
+        self.min_concurrency = min_concurrency or ai_settings.AI_MIN_CONCURRENCY
+        self.concurrency_limit = float(self.max_concurrency)
+        self.in_flight = 0
+
+        self._requests = TokenBucket(
+            requests_per_minute or ai_settings.AI_REQUESTS_PER_MINUTE
+        )
+        self._tokens = TokenBucket(tokens_per_minute or ai_settings.AI_TOKENS_PER_MINUTE)
+        self._lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "queued_seconds": 0.0,
+            "max_queued_seconds": 0.0,
+            "call_seconds": 0.0,
+        }
+
+    def _try_acquire(self, estimated_tokens: int) -> float:
+        """Take a slot and budget if available, else return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+
+            if self.in_flight >= math.floor(self.concurrency_limit):
+                return _SLOT_POLL_SECONDS
+
+            wait = max(
+                self._requests.wait_time(1), self._tokens.wait_time(estimated_tokens)
+            )
+            if wait > 0:
+                return wait
+
+            self._requests.tokens -= 1
+            self._tokens.tokens -= estimated_tokens
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Block until the call may proceed; returns the time spent queued"""
+        started = time.monotonic()
+        while (wait := self._try_acquire(estimated_tokens)) > 0:
+            time.sleep(wait)
+        return time.monotonic() - started
+
+    async def aacquire(self, estimated_tokens: int) -> float:
+        """Async variant of acquire that yields to the event loop while waiting"""
+        started = time.monotonic()
+        while (wait := self._try_acquire(estimated_tokens)) > 0:
+            await asyncio.sleep(wait)
+        return time.monotonic() - started
+
+    def release(
+        self,
+        estimated_tokens: int,
+        actual_tokens: Optional[int],
+        queued_seconds: float,
+        call_seconds: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Return the slot, settle the token budget and adapt concurrency"""
+        with self._lock:
+            self.in_flight -= 1
+
+            # Charge (or refund) the difference between estimate and usage.
+            # A failed call that used no tokens gets its whole estimate back;
+            # a successful one without usage data keeps the estimate charged
+            if actual_tokens or error is not None:
+                self._tokens.tokens = min(
+                    self._tokens.capacity,
+                    self._tokens.tokens - ((actual_tokens or 0) - estimated_tokens),
+                )
+
+            if error is not None and is_rate_limit_error(error):
+                self._metrics["rate_limited"] += 1
+                self.concurrency_limit = max(
+                    float(self.min_concurrency), self.concurrency_limit / 2
+                )
+            elif error is not None:
+                self._metrics["errors"] += 1
+            else:
+                self.concurrency_limit = min(
+                    float(self.max_concurrency),
+                    self.concurrency_limit + 1 / self.concurrency_limit,
+                )
+
+            self._metrics["requests"] += 1
+            self._metrics["queued_seconds"] += queued_seconds
+            self._metrics["call_seconds"] += call_seconds
+            self._metrics["max_queued_seconds"] = max(
+                self._metrics["max_queued_seconds"], queued_seconds
+            )
+
+    def wrap(self, runnable: Runnable) -> Runnable:
+        """Return a runnable that sends every call through this limiter"""
+
+        def invoke(prompt: Any, config: RunnableConfig) -> Any:
+            estimated = _estimate_tokens(prompt)
+            handler = UsageMetadataCallbackHandler()
+            queued = self.acquire(estimated)
+            started = time.monotonic()
+            error = None
+            try:
+                return runnable.invoke(prompt, _with_handler(config, handler))
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.release(
+                    estimated,
+                    _total_tokens(handler),
+                    queued,
+                    time.monotonic() - started,
+                    error,
+                )
+
+        async def ainvoke(prompt: Any, config: RunnableConfig) -> Any:
+            estimated = _estimate_tokens(prompt)
+            handler = UsageMetadataCallbackHandler()
+            queued = await self.aacquire(estimated)
+            started = time.monotonic()
+            error = None
+            try:
+                return await runnable.ainvoke(prompt, _with_handler(config, handler))
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.release(
+                    estimated,
+                    _total_tokens(handler),
+                    queued,
+                    time.monotonic() - started,
+                    error,
+                )
+
+        return RunnableLambda(invoke, afunc=ainvoke, name="rate_limited")
+
+    def wrap_stream(self, stream_fn: StreamFn) -> StreamFn:
+        """
+        Like wrap, for a ``stream_fn(prompt, config)`` async iterator: the
+        slot is held until the stream is exhausted, fails or is closed
+        """
+
+        async def stream(prompt: Any, config: RunnableConfig) -> AsyncIterator[Any]:
+            estimated = _estimate_tokens(prompt)
+            handler = UsageMetadataCallbackHandler()
+            queued = await self.aacquire(estimated)
+            started = time.monotonic()
+            error = None
+            try:
+                async for item in stream_fn(prompt, _with_handler(config, handler)):
+                    yield item
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self.release(
+                    estimated,
+                    _total_tokens(handler),
+                    queued,
+                    time.monotonic() - started,
+                    error,
+                )
+
+        return stream
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self._metrics["requests"] or 1
+            return {
+                "requests": self._metrics["requests"],
+                "rate_limited": self._metrics["rate_limited"],
+                "errors": self._metrics["errors"],
+                "in_flight": self.in_flight,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "avg_queued_ms": round(
+                    self._metrics["queued_seconds"] / requests * 1000, 2
+                ),
+                "max_queued_ms": round(self._metrics["max_queued_seconds"] * 1000, 2),
+                "avg_call_ms": round(self._metrics["call_seconds"] / requests * 1000, 2),
+                "available_requests": round(self._requests.tokens, 2),
+                "available_tokens": round(self._tokens.tokens, 2),
+            }
+
+
+_rate_limiter: Optional[AdaptiveRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[AdaptiveRateLimiter]:
+    """Return the shared rate limiter, or None when rate limiting is disabled"""
+    global _rate_limiter
+    if not ai_settings.AI_RATE_LIMIT_ENABLED:
+        return None
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = AdaptiveRateLimiter()
+        return _rate_limiter
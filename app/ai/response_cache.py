@@ -0,0 +1,176 @@
+# app/ai/response_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.ai_config import ai_settings
+
+# Cache hits whose access times are buffered before being written in one go
+_TOUCH_FLUSH_SIZE = 512
+
+
+class LLMResponseCache:
+    """Content-addressed cache of structured LLM responses.
+
+    Entries are keyed by a hash of the rendered prompt, model name,
+    temperature and output schema, stored in a local SQLite file, expire
+    after a TTL and are evicted least-recently-used once the cache grows
+    beyond ``max_entries``. Hits only record their access time in memory;
+    the times are written with the next store (before eviction runs) or
+    once ``_TOUCH_FLUSH_SIZE`` have accumulated, so a hit never commits.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.path = path or ai_settings.AI_CACHE_PATH
+        self.ttl_seconds = ttl_seconds or ai_settings.AI_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or ai_settings.AI_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_accessed "
+            "ON llm_response_cache (last_accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, schema: str) -> str:
+        """Hash everything that determines the model's response"""
+        payload = json.dumps(
+            {
+                "prompt": prompt,
+                "model": model,
+                "temperature": temperature,
+                "schema": schema,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a key, or None on a miss/expiry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_response_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM llm_response_cache WHERE key = ?", (key,)
+                )
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            # Touch the entry so LRU eviction keeps it
+            self._touched[key] = now
+            if len(self._touched) >= _TOUCH_FLUSH_SIZE:
+                self._write_touches()
+                self._conn.commit()
+            self.hits += 1
+            return json.loads(response)
+
+    def _write_touches(self) -> None:
+        # Caller holds self._lock and commits
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_response_cache SET last_accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response and evict the least recently used overflow"""
+        self.set_many({key: response})
+
+    def set_many(self, responses: Dict[str, Dict[str, Any]]) -> None:
+        """Store several responses in one transaction, then evict overflow"""
+        now = time.time()
+        with self._lock:
+            self._write_touches()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO llm_response_cache "
+                "(key, response, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                [
+                    (key, json.dumps(response), now, now)
+                    for key, response in responses.items()
+                ],
+            )
+            self._conn.execute(
+                """
+                DELETE FROM llm_response_cache WHERE key IN (
+                    SELECT key FROM llm_response_cache
+                    ORDER BY last_accessed DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry and reset the hit/miss counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response_cache")
+            self._conn.commit()
+            self._touched.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM llm_response_cache"
+            ).fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Return the shared response cache, or None when caching is disabled"""
+    global _response_cache
+    if not ai_settings.AI_CACHE_ENABLED:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = LLMResponseCache()
+        return _response_cache
@@ -0,0 +1,7 @@
+# app/ai/schemas/analysis_schema.py
+from app.ai.schemas.priority_schema import PrioritySchema
+from app.ai.schemas.insights_schema import InsightsSchema
+
+
+class CombinedAnalysisSchema(PrioritySchema, InsightsSchema):
+    """Schema for single-call dispute analysis (priority, insights and risk)"""
@@ -0,0 +1,57 @@
+# app/ai/usage.py
+import threading
+from typing import Dict, Any
+
+
+class UsageTracker:
+    """Thread-safe per-mode counters of analyses, LLM calls and tokens"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(
+        self,
+        mode: str,
+        llm_calls: int,
+        input_tokens: int,
+        output_tokens: int,
+        cache_hits: int = 0,
+    ) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                mode,
+                {
+                    "analyses": 0,
+                    "llm_calls": 0,
+                    "cache_hits": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                },
+            )
+            stats["analyses"] += 1
+            stats["llm_calls"] += llm_calls
+            stats["cache_hits"] += cache_hits
+            stats["input_tokens"] += input_tokens
+            stats["output_tokens"] += output_tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return totals and per-analysis averages for each mode"""
+        with self._lock:
+            result = {}
+            for mode, stats in self._stats.items():
+                analyses = stats["analyses"] or 1
+                result[mode] = {
+                    **stats,
+                    "avg_input_tokens": round(stats["input_tokens"] / analyses, 2),
+                    "avg_output_tokens": round(stats["output_tokens"] / analyses, 2),
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+# Shared tracker used by DisputeAIService
+usage_tracker = UsageTracker()
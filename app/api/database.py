@@ -1,5 +1,6 @@
 # app/api/database.py
 from datetime import datetime
+from typing import Any, Dict, Optional
 from app.core.config import settings
 from sqlalchemy import (
     create_engine,
@@ -11,20 +12,79 @@ from sqlalchemy import (
     Text,
     DateTime,
     Boolean,
+    Computed,
+    Index,
+    JSON,
     case,
     func,
+    inspect,
+    text,
 )
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship, Session
+from sqlalchemy.pool import QueuePool
 from sqlalchemy import event
 from sqlite3 import Connection as SQLite3Connection
+import ast
+import json
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """The SQLite pragma profile from settings, skipping empty values"""
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+    return {name: value for name, value in pragmas.items() if value not in ("", None)}
+
+
+def create_db_engine(url: str, pragmas: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Create an engine with the configured connection pool. New SQLite
+    connections get foreign keys plus ``pragmas`` (default: sqlite_pragmas())
+    """
+    if pragmas is None:
+        pragmas = sqlite_pragmas()
+
+    pool_options = {}
+    if ":memory:" not in url:
+        pool_options = {
+            "poolclass": QueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+    db_engine = create_engine(
+        url, connect_args={"check_same_thread": False}, **pool_options
+    )
+
+    @event.listens_for(db_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, SQLite3Connection):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return db_engine
+
+
 # Create SQLite engine
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -46,6 +106,10 @@ class Customer(Base):
     disputes = relationship("Dispute", back_populates="customer")
 
 
+# Customer listing order (oldest first), with id as the cursor tie-breaker
+Index("ix_customers_created", Customer.created_at, Customer.id)
+
+
 class Dispute(Base):
     __tablename__ = "disputes"
 
@@ -58,6 +122,8 @@ class Dispute(Base):
     category = Column(String, index=True)  # e.g., "Unauthorized", "Duplicate"
     status = Column(String, default="Open")  # "Open", "Under Review", "Resolved"
     priority = Column(Integer, nullable=True)  # 1-5, with 5 being highest priority
+    # Indexable sort key: priority with unprioritized disputes (NULL) as 0
+    priority_sort = Column(Integer, Computed("coalesce(priority, 0)"))
     created_at = Column(DateTime, default=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
 
@@ -69,6 +135,42 @@ class Dispute(Base):
     )
 
 
+# Composite indexes matching the list endpoints' filters and ordering, so
+# they are served by index range scans instead of a sort. Each ends in id,
+# the tie-breaker used by cursor pagination
+Index(
+    "ix_disputes_priority_sort_created",
+    Dispute.priority_sort.desc(),
+    Dispute.created_at.desc(),
+    Dispute.id.desc(),
+)
+Index(
+    "ix_disputes_status_priority_sort_created",
+    Dispute.status,
+    Dispute.priority_sort.desc(),
+    Dispute.created_at.desc(),
+    Dispute.id.desc(),
+)
+Index(
+    "ix_disputes_priority_created",
+    Dispute.priority,
+    Dispute.created_at.desc(),
+    Dispute.id.desc(),
+)
+Index(
+    "ix_disputes_amount_created",
+    Dispute.amount.desc(),
+    Dispute.created_at.desc(),
+    Dispute.id.desc(),
+)
+Index(
+    "ix_disputes_customer_created",
+    Dispute.customer_id,
+    Dispute.created_at,
+    Dispute.id,
+)
+
+
 class DisputeNote(Base):
     __tablename__ = "dispute_notes"
 
@@ -90,23 +192,33 @@ class DisputeInsight(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     dispute_id = Column(
-        String, ForeignKey("disputes.id", ondelete="CASCADE"), nullable=False
+        String,
+        ForeignKey("disputes.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        unique=True,  # one insight per dispute
     )
 
     # Core insight fields
     insights = Column(String, nullable=False)
-    followup_questions = Column(String, nullable=False)
-    probable_solutions = Column(String, nullable=False)
-    possible_reasons = Column(String, nullable=False)
+    followup_questions = Column(JSON, nullable=False)
+    probable_solutions = Column(JSON, nullable=False)
+    possible_reasons = Column(JSON, nullable=False)
 
     # Risk assessment
     risk_score = Column(Float, nullable=False)
-    risk_factors = Column(String, nullable=False)
+    risk_factors = Column(JSON, nullable=False)
 
     # Priority fields (from your existing model)
     priority_level = Column(Integer, nullable=False)
     priority_reason = Column(String, nullable=False)
 
+    # Rule-based fallback stored while the LLM was unavailable; upgraded to
+    # a full AI analysis on the next analyze/batch run
+    is_provisional = Column(
+        Boolean, nullable=False, default=False, server_default="0"
+    )
+
     # Metadata
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
@@ -118,17 +230,340 @@ class DisputeInsight(Base):
         return f"<DisputeInsight(id={self.id}, dispute_id={self.dispute_id})>"
 
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+class AnalysisJob(Base):
+    """Background AI analysis job, persisted so restarts don't lose work"""
+
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String, primary_key=True, index=True)
+    dispute_id = Column(
+        String, ForeignKey("disputes.id", ondelete="CASCADE"), nullable=False
+    )
+    status = Column(String, default="queued", index=True)
+    result = Column(Text, nullable=True)  # JSON-encoded analysis result
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<AnalysisJob(id={self.id}, status={self.status})>"
+
+
+class DisputeStat(Base):
+    """
+    Running dispute counters, one row per (dimension, bucket), kept in step
+    with the disputes table by maintain_dispute_stats so metrics read a few
+    rows instead of scanning every dispute
+    """
+
+    __tablename__ = "dispute_stats"
+
+    # "total", "category", "status", "priority" or "resolved_day"
+    dimension = Column(String, primary_key=True)
+    bucket = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    amount_sum = Column(Float, nullable=False, default=0.0)
+    # Sum of created -> resolved durations; only set on "resolved_day" rows
+    resolution_hours_sum = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<DisputeStat({self.dimension}={self.bucket}, count={self.count})>"
+
+
+# Dispute attributes the stats depend on
+STAT_ATTRIBUTES = (
+    "category",
+    "status",
+    "priority",
+    "amount",
+    "created_at",
+    "resolved_at",
+)
 
 
-# Add this event listener
-@event.listens_for(engine, "connect")
-def set_sqlite_pragma(dbapi_connection, connection_record):
-    if isinstance(dbapi_connection, SQLite3Connection):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+def stat_bucket(value: Any) -> str:
+    return "none" if value is None else str(value)
+
+
+def dispute_stat_deltas(values: Dict[str, Any], sign: int = 1) -> Dict[tuple, list]:
+    """
+    Counter contributions of one dispute, as
+    {(dimension, bucket): [count, amount_sum, resolution_hours_sum]}
+    """
+    amount = (values["amount"] or 0.0) * sign
+    deltas = {
+        ("total", "all"): [sign, amount, 0.0],
+        ("category", stat_bucket(values["category"])): [sign, amount, 0.0],
+        ("status", stat_bucket(values["status"])): [sign, amount, 0.0],
+        ("priority", stat_bucket(values["priority"])): [sign, amount, 0.0],
+    }
+    resolved_at = values["resolved_at"]
+    if resolved_at is not None:
+        hours = (resolved_at - values["created_at"]).total_seconds() / 3600
+        deltas[("resolved_day", resolved_at.date().isoformat())] = [
+            sign,
+            amount,
+            hours * sign,
+        ]
+    return deltas
+
+
+def _apply_python_defaults(dispute: Dispute) -> None:
+    # Column defaults are only applied during the INSERT, after this hook,
+    # so fill them in now to count the values that will actually be stored
+    for name in ("status", "created_at"):
+        default = Dispute.__table__.c[name].default
+        if getattr(dispute, name) is None and default is not None:
+            value = default.arg(None) if default.is_callable else default.arg
+            setattr(dispute, name, value)
+
+
+def _stat_values(dispute: Dispute, previous: bool) -> Dict[str, Any]:
+    state = inspect(dispute)
+    values = {}
+    for name in STAT_ATTRIBUTES:
+        history = state.attrs[name].history
+        if previous and history.deleted:
+            values[name] = history.deleted[0]
+        elif previous and history.added:
+            values[name] = None
+        else:
+            values[name] = getattr(dispute, name)
+    return values
+
+
+def merge_stat_deltas(
+    deltas: Dict[tuple, list], changes: Dict[tuple, list]
+) -> None:
+    """Add one dispute's dispute_stat_deltas into a running total"""
+    for key, change in changes.items():
+        totals = deltas.setdefault(key, [0, 0.0, 0.0])
+        for i, value in enumerate(change):
+            totals[i] += value
+
+
+def apply_stat_deltas(connection, deltas: Dict[tuple, list]) -> None:
+    """
+    Add merged deltas to dispute_stats on ``connection``. Writes that bypass
+    the unit of work (bulk inserts) must call this in their own transaction.
+    """
+    changes = [
+        {
+            "dimension": dimension,
+            "bucket": bucket,
+            "count": count,
+            "amount_sum": amount,
+            "resolution_hours_sum": hours,
+        }
+        for (dimension, bucket), (count, amount, hours) in deltas.items()
+        if count or amount or hours
+    ]
+    if not changes:
+        return
+
+    stats = DisputeStat.__table__
+    upsert = sqlite_insert(stats)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[stats.c.dimension, stats.c.bucket],
+        set_={
+            "count": stats.c.count + upsert.excluded.count,
+            "amount_sum": stats.c.amount_sum + upsert.excluded.amount_sum,
+            "resolution_hours_sum": stats.c.resolution_hours_sum
+            + upsert.excluded.resolution_hours_sum,
+        },
+    )
+    connection.execute(upsert, changes)
+    connection.execute(stats.delete().where(stats.c.count == 0))
+
+
+@event.listens_for(Session, "before_flush")
+def maintain_dispute_stats(session, flush_context, instances) -> None:
+    """
+    Apply the counter changes for every dispute inserted, updated or deleted
+    in this flush, inside the same transaction as the dispute rows
+    """
+    deltas: Dict[tuple, list] = {}
+    for dispute in session.new:
+        if isinstance(dispute, Dispute):
+            _apply_python_defaults(dispute)
+            merge_stat_deltas(
+                deltas, dispute_stat_deltas(_stat_values(dispute, previous=False))
+            )
+    for dispute in session.dirty:
+        if isinstance(dispute, Dispute) and session.is_modified(dispute):
+            previous = _stat_values(dispute, previous=True)
+            merge_stat_deltas(deltas, dispute_stat_deltas(previous, -1))
+            merge_stat_deltas(
+                deltas, dispute_stat_deltas(_stat_values(dispute, previous=False))
+            )
+    for dispute in session.deleted:
+        if isinstance(dispute, Dispute):
+            previous = _stat_values(dispute, previous=True)
+            merge_stat_deltas(deltas, dispute_stat_deltas(previous, -1))
+
+    if deltas:
+        apply_stat_deltas(session.connection(), deltas)
+
+
+def add_missing_columns(bind) -> None:
+    """
+    Add model columns missing from existing tables.
+
+    create_all only creates tables that don't exist yet, so columns added
+    to a model later are applied here with ALTER TABLE ... ADD COLUMN.
+    """
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+            ddl += column.type.compile(dialect=bind.dialect)
+            if column.computed is not None:
+                # Only VIRTUAL generated columns can be added to a table
+                ddl += f" GENERATED ALWAYS AS ({column.computed.sqltext}) VIRTUAL"
+            elif column.server_default is not None:
+                # SQLite only allows NOT NULL on added columns with a default
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                ddl += f" DEFAULT {column.server_default.arg}"
+            with bind.begin() as connection:
+                connection.execute(text(ddl))
+
+
+# Rows that block the unique index on dispute_insights.dispute_id
+_DUPLICATE_INSIGHTS = (
+    "FROM dispute_insights WHERE rowid NOT IN "
+    "(SELECT max(rowid) FROM dispute_insights GROUP BY dispute_id)"
+)
+
+
+def count_duplicate_insights(bind) -> int:
+    """Number of insights that aren't the newest for their dispute"""
+    if not inspect(bind).has_table(DisputeInsight.__tablename__):
+        return 0
+    with bind.connect() as connection:
+        return connection.execute(
+            text(f"SELECT count(*) {_DUPLICATE_INSIGHTS}")
+        ).scalar()
+
+
+def deduplicate_insights(bind) -> int:
+    """
+    Delete all but the newest insight of each dispute, so the unique index
+    on dispute_id can be built. Destructive, so it only runs when asked for
+    (python -m app.cli dedupe-insights). Returns the number of rows deleted.
+    """
+    if not inspect(bind).has_table(DisputeInsight.__tablename__):
+        return 0
+    with bind.begin() as connection:
+        deleted = connection.execute(text(f"DELETE {_DUPLICATE_INSIGHTS}")).rowcount
+    logger.warning("Deleted %d duplicate dispute insights", deleted)
+    return deleted
+
+
+def create_missing_indexes(bind) -> None:
+    """
+    Create model indexes missing from existing tables (create_all skips
+    tables that already exist). The unique insight index is skipped, with
+    a warning, while older versions' duplicate insights remain; see
+    deduplicate_insights.
+    """
+    inspector = inspect(bind)
+    duplicates = count_duplicate_insights(bind)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        for index in table.indexes:
+            if index.unique and table is DisputeInsight.__table__ and duplicates:
+                logger.warning(
+                    "Not creating unique index %s: %d duplicate dispute insights. "
+                    "Run 'python -m app.cli dedupe-insights' to remove them.",
+                    index.name,
+                    duplicates,
+                )
+                continue
+            index.create(bind, checkfirst=True)
+
+
+# DisputeInsight columns holding lists of strings as JSON arrays
+INSIGHT_LIST_COLUMNS = (
+    "followup_questions",
+    "probable_solutions",
+    "possible_reasons",
+    "risk_factors",
+)
+
+
+def _as_string_list(raw: Any) -> list:
+    """
+    Best-effort list of strings from a stored insight value: a JSON array,
+    a Python list repr written by older code, or a single plain string
+    """
+    if raw is None or not str(raw).strip():
+        return []
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            value = parse(raw)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+        if isinstance(value, (list, tuple)):
+            return [str(item) for item in value]
+        if value is None:
+            return []
+        return [str(value)]
+    return [str(raw)]
+
+
+def migrate_insight_list_columns(bind) -> int:
+    """
+    Rewrite insight list values that aren't JSON arrays as JSON arrays.
+
+    The list columns used to be plain strings filled by json.dumps (and, in
+    places, str() of a list), so SQLite already stores them as TEXT; only
+    values the JSON type can't load, or that aren't arrays, need rewriting.
+    Returns the number of values fixed.
+    """
+    if not inspect(bind).has_table(DisputeInsight.__tablename__):
+        return 0
+
+    fixed = 0
+    with bind.begin() as connection:
+        for column in INSIGHT_LIST_COLUMNS:
+            rows = connection.execute(
+                text(
+                    f"SELECT id, {column} FROM dispute_insights WHERE "
+                    f"CASE WHEN json_valid({column}) THEN json_type({column}) END "
+                    "IS NOT 'array'"
+                )
+            ).all()
+            if rows:
+                connection.execute(
+                    text(
+                        f"UPDATE dispute_insights SET {column} = :value "
+                        "WHERE id = :id"
+                    ),
+                    [
+                        {"id": row.id, "value": json.dumps(_as_string_list(row[1]))}
+                        for row in rows
+                    ],
+                )
+                fixed += len(rows)
+    return fixed
+
+
+# Create all tables
+Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+create_missing_indexes(engine)
+migrate_insight_list_columns(engine)
 
 
 # Dependency
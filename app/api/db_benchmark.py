@@ -0,0 +1,171 @@
+# app/api/db_benchmark.py
+"""
+Mixed read/write load against a scratch SQLite database, comparing SQLite's
+default connection settings with the configured pragma profile.
+
+Usage:
+    python -m app.cli bench-db [--readers N] [--writers N] [--seconds S] [--rows N]
+"""
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.database import (
+    Base,
+    Customer,
+    Dispute,
+    create_db_engine,
+    sqlite_pragmas,
+)
+
+# Connection profile before tuning: rollback journal, synchronous=FULL
+DEFAULT_PROFILE: Dict[str, Any] = {}
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _seed(session_factory, rows: int) -> List[str]:
+    db = session_factory()
+    try:
+        customer_ids = [str(uuid.uuid4()) for _ in range(max(1, rows // 10))]
+        db.add_all(
+            Customer(
+                id=customer_id,
+                name=f"Customer {i}",
+                email=f"bench{i}@example.com",
+                account_type="Individual",
+                dispute_count=0,
+            )
+            for i, customer_id in enumerate(customer_ids)
+        )
+        db.add_all(
+            _new_dispute(customer_ids[i % len(customer_ids)]) for i in range(rows)
+        )
+        db.commit()
+        return customer_ids
+    finally:
+        db.close()
+
+
+def _new_dispute(customer_id: str) -> Dispute:
+    return Dispute(
+        id=str(uuid.uuid4()),
+        customer_id=customer_id,
+        transaction_id=f"TX{uuid.uuid4().hex[:8]}",
+        merchant_name="Bench Merchant",
+        amount=100.0,
+        description="Benchmark dispute",
+        category="Other",
+        status="Open",
+        created_at=datetime.utcnow(),
+    )
+
+
+def run_benchmark(
+    name: str,
+    pragmas: Dict[str, Any],
+    readers: int = 8,
+    writers: int = 2,
+    seconds: float = 5.0,
+    rows: int = 2000,
+) -> Dict[str, Any]:
+    """
+    Run ``readers`` list queries and ``writers`` insert+commit loops in
+    parallel threads for ``seconds`` and report throughput, p95 latency and
+    "database is locked" errors
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        engine = create_db_engine(
+            f"sqlite:///{os.path.join(scratch, 'bench.db')}", pragmas
+        )
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=engine
+        )
+        customer_ids = _seed(session_factory, rows)
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        latencies: Dict[str, List[float]] = {"read": [], "write": []}
+        errors = {"read": 0, "write": 0}
+
+        def record(kind: str, started: float, error: bool) -> None:
+            with lock:
+                if error:
+                    errors[kind] += 1
+                else:
+                    latencies[kind].append((time.perf_counter() - started) * 1000)
+
+        def read_loop() -> None:
+            db = session_factory()
+            latest = db.query(Dispute).order_by(Dispute.created_at.desc()).limit(100)
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        latest.with_session(db).all()
+                        db.rollback()  # end the read transaction
+                        record("read", started, False)
+                    except OperationalError:
+                        db.rollback()
+                        record("read", started, True)
+            finally:
+                db.close()
+
+        def write_loop(worker: int) -> None:
+            db = session_factory()
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        db.add(_new_dispute(customer_ids[worker % len(customer_ids)]))
+                        db.commit()
+                        record("write", started, False)
+                    except OperationalError:
+                        db.rollback()
+                        record("write", started, True)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=read_loop) for _ in range(readers)]
+        threads += [
+            threading.Thread(target=write_loop, args=(i,)) for i in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    return {
+        "profile": name,
+        "pragmas": pragmas,
+        "reads_per_s": round(len(latencies["read"]) / seconds, 1),
+        "writes_per_s": round(len(latencies["write"]) / seconds, 1),
+        "read_p95_ms": round(_percentile(latencies["read"], 0.95), 2),
+        "write_p95_ms": round(_percentile(latencies["write"], 0.95), 2),
+        "read_errors": errors["read"],
+        "write_errors": errors["write"],
+    }
+
+
+def compare_profiles(**options: Any) -> List[Dict[str, Any]]:
+    """Benchmark SQLite defaults, then the configured pragma profile"""
+    return [
+        run_benchmark("default", DEFAULT_PROFILE, **options),
+        run_benchmark("tuned", sqlite_pragmas(), **options),
+    ]
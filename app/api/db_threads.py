@@ -0,0 +1,29 @@
+# app/api/db_threads.py
+"""
+Blocking SQLAlchemy work runs on a bounded worker thread pool instead of the
+event loop. Routes that only touch the database are plain ``def`` functions,
+which FastAPI runs on this pool; async handlers that also await the AI
+service hand their database steps to it through ``run_in_threadpool``.
+"""
+from typing import Any, Dict, Optional
+
+import anyio.to_thread
+
+from app.core.config import settings
+
+
+def configure_db_threadpool(size: Optional[int] = None) -> None:
+    """Bound the current event loop's worker thread pool"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = size or settings.DB_THREADPOOL_SIZE
+
+
+def db_threadpool_stats() -> Dict[str, Any]:
+    """Pool size, threads in use and calls queued waiting for a thread"""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    statistics = limiter.statistics()
+    return {
+        "size": limiter.total_tokens,
+        "busy": statistics.borrowed_tokens,
+        "queued": statistics.tasks_waiting,
+    }
@@ -55,6 +55,13 @@ class DisputeWithCustomer(Dispute):
     
     model_config = ConfigDict(from_attributes=True, extra="ignore")
 
+class DisputeListItem(Dispute):
+    """Listing entry; customer is only included with ?expand=customer"""
+
+    customer: Optional[Customer] = None
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+
 # Note Models
 class NoteCreate(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -110,6 +117,35 @@ class DisputeAnalysisResponse(BaseModel):
     dispute_id: str
     analysis: Dict[str, Any]
 
+class AnalysisJob(BaseModel):
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
+    
+    id: str
+    dispute_id: str
+    status: str  # "queued", "running", "completed", "failed"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+class BulkRowResult(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    index: int  # position of the row in the request
+    status: str  # "created" or "error"
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkIngestReport(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    total: int
+    created: int
+    failed: int
+    results: List[BulkRowResult]
+
 class DashboardMetrics(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
@@ -145,6 +181,7 @@ class Insights(BaseModel):
     )
     priority_level: int
     priority_reason: str
+    is_provisional: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -169,3 +206,11 @@ class InsightsCreate(BaseModel):
     )
     priority_level: int
     priority_reason: str
+
+class DisputeFull(DisputeWithCustomer):
+    """Everything the dispute details page shows, in one response"""
+
+    insights: Optional[Insights] = None
+    notes: List[Note] = []
+
+    model_config = ConfigDict(from_attributes=True, extra="ignore")
@@ -0,0 +1,26 @@
+# app/api/routes/analysis_jobs.py
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.database import get_db, AnalysisJob
+from app.api.models import AnalysisJob as AnalysisJobModel
+
+router = APIRouter()
+
+
+def format_job_response(job: AnalysisJob) -> AnalysisJobModel:
+    """Convert an AnalysisJob row to its Pydantic model, decoding the result"""
+    job_data = job.__dict__.copy()
+    job_data["result"] = json.loads(job.result) if job.result else None
+    return AnalysisJobModel.model_validate(job_data)
+
+
+@router.get("/{job_id}", response_model=AnalysisJobModel)
+def get_analysis_job(job_id: str, db: Session = Depends(get_db)):
+    """Get the status (and result, once completed) of an analysis job"""
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+
+    return format_job_response(job)
@@ -1,19 +1,31 @@
 # app/api/routes/customers.py
 import uuid
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.api.database import get_db, Customer
 from app.api.models import Dispute as DisputeModel
 from app.api.database import Dispute as DbDispute
-from app.api.models import CustomerCreate, Customer as CustomerModel
+from app.api.models import BulkIngestReport, CustomerCreate, Customer as CustomerModel
+from app.api.services.bulk_ingest import ingest_customers
+from app.api.services.dispute_query import VALID_STATUSES
+from app.api.services.pagination import (
+    NEXT_CURSOR_HEADER,
+    after_cursor,
+    next_cursor,
+    order_by_keys,
+)
 
 router = APIRouter()
 
+# Listing orders; id is the unique tie-breaker for cursor pagination
+CUSTOMER_SORT_KEYS = [(Customer.created_at, False), (Customer.id, False)]
+CUSTOMER_DISPUTE_SORT_KEYS = [(DbDispute.created_at, True), (DbDispute.id, True)]
+
 
 @router.post("/", response_model=CustomerModel, status_code=201)
-async def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
+def create_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
     """Create a new customer"""
     # Check if customer with this email already exists
     db_customer = db.query(Customer).filter(Customer.email == customer.email).first()
@@ -37,14 +49,31 @@ async def create_customer(customer: CustomerCreate, db: Session = Depends(get_db
     return CustomerModel.model_validate(new_customer.__dict__)
 
 
+@router.post("/bulk", response_model=BulkIngestReport)
+async def bulk_create_customers(request: Request, db: Session = Depends(get_db)):
+    """
+    Create customers from a JSON array or an NDJSON stream
+    (application/x-ndjson), in chunked transactions. Invalid rows and
+    duplicate emails are reported per row instead of failing the request.
+    """
+    try:
+        return await ingest_customers(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/", response_model=List[CustomerModel])
-async def get_customers(
+def get_customers(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     account_type: str = None,
+    cursor: Optional[str] = Query(
+        None, description=f"Keyset cursor from {NEXT_CURSOR_HEADER}; replaces skip"
+    ),
 ):
-    """Get all customers with optional filtering"""
+    """Get all customers (oldest first) with optional filtering"""
     query = db.query(Customer)
 
     # Apply filters
@@ -52,14 +81,25 @@ async def get_customers(
         query = query.filter(Customer.account_type == account_type)
 
     # Apply pagination
+    if cursor:
+        try:
+            query = after_cursor(query, CUSTOMER_SORT_KEYS, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        skip = 0
+    query = order_by_keys(query, CUSTOMER_SORT_KEYS)
     customers = query.offset(skip).limit(limit).all()
 
+    cursor = next_cursor(customers, CUSTOMER_SORT_KEYS, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
     # Convert to Pydantic models
     return [CustomerModel.model_validate(customer.__dict__) for customer in customers]
 
 
 @router.get("/{customer_id}", response_model=CustomerModel)
-async def get_customer(customer_id: str, db: Session = Depends(get_db)):
+def get_customer(customer_id: str, db: Session = Depends(get_db)):
     """Get a specific customer"""
     customer = db.query(Customer).filter(Customer.id == customer_id).first()
     if not customer:
@@ -70,12 +110,16 @@ async def get_customer(customer_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{customer_id}/disputes", response_model=List[DisputeModel])
-async def get_customer_disputes(
+def get_customer_disputes(
     customer_id: str,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        None, description=f"Keyset cursor from {NEXT_CURSOR_HEADER}; replaces skip"
+    ),
 ):
     """Get all disputes for a specific customer with filtering"""
     try:
@@ -89,19 +133,23 @@ async def get_customer_disputes(
 
         # Apply status filter if provided
         if status:
-            valid_statuses = ["Open", "Under Review", "Resolved"]
-            if status not in valid_statuses:
+            if status not in VALID_STATUSES:
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
+                    detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}",
                 )
             query = query.filter(DbDispute.status == status)
 
         # Apply sorting and pagination
-        query = query.order_by(DbDispute.created_at.desc())
+        if cursor:
+            try:
+                query = after_cursor(query, CUSTOMER_DISPUTE_SORT_KEYS, cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        query = order_by_keys(query, CUSTOMER_DISPUTE_SORT_KEYS)
 
         # Validate pagination parameters
-        if skip < 0:
+        if skip < 0 or cursor:
             skip = 0
         if limit <= 0:
             limit = 100
@@ -110,6 +158,10 @@ async def get_customer_disputes(
 
         disputes = query.offset(skip).limit(limit).all()
 
+        cursor = next_cursor(disputes, CUSTOMER_DISPUTE_SORT_KEYS, limit)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+
         # Convert to Pydantic models
         return [DisputeModel.model_validate(dispute.__dict__) for dispute in disputes]
     except HTTPException as e:
@@ -123,7 +175,7 @@ async def get_customer_disputes(
 
 
 @router.put("/{customer_id}", response_model=CustomerModel)
-async def update_customer(
+def update_customer(
     customer_id: str, customer_update: CustomerCreate, db: Session = Depends(get_db)
 ):
     """Update a customer"""
@@ -152,7 +204,7 @@ async def update_customer(
 
 
 @router.delete("/{customer_id}", response_model=dict)
-async def delete_customer(customer_id: str, db: Session = Depends(get_db)):
+def delete_customer(customer_id: str, db: Session = Depends(get_db)):
     """Delete a customer with option to cascade delete disputes"""
     customer = db.query(Customer).filter(Customer.id == customer_id).first()
     if not customer:
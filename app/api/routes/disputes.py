@@ -1,31 +1,69 @@
 # app/api/routes/disputes.py
+import logging
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import case
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from starlette.concurrency import run_in_threadpool
 import json
 from app.api.database import get_db, Dispute, Customer, DisputeNote, DisputeInsight
 from app.api.models import (
+    BulkIngestReport,
     DisputeCreate,
     Dispute as DisputeModel,
     DisputeUpdate,
     DisputeWithCustomer,
+    DisputeListItem,
+    DisputeFull,
     DisputeAnalysisResponse,
+    AnalysisJob as AnalysisJobModel,
 )
+from app.api.routes.analysis_jobs import format_job_response
+from app.api.services.analysis_queue import analysis_queue
+from app.api.services.analysis_service import (
+    analyze_and_store,
+    get_analysis_context,
+    stream_analysis,
+)
+from app.api.services.batch_analysis import run_batch_analysis
+from app.api.services.bulk_ingest import ingest_disputes
+from app.api.services.dispute_export import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    stream_export,
+)
+from app.api.services.dispute_query import (
+    VALID_STATUSES,
+    DisputeSort,
+    build_dispute_query,
+    dispute_sort_keys,
+    expand_dispute_query,
+)
+from app.api.services.pagination import NEXT_CURSOR_HEADER, next_cursor
+from app.core.config import settings
 from app.ai.langchain_service import DisputeAIService
+from app.ai.client_pool import ai_service_pool
+from app.ai.circuit_breaker import get_circuit_breaker
+from app.ai.rate_limiter import get_rate_limiter
+from app.ai.response_cache import get_response_cache
+from app.ai.usage import usage_tracker
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 # Dependency for AI service
-def get_ai_service():
-    return DisputeAIService()
+async def get_ai_service():
+    return ai_service_pool.acquire()
 
 
 @router.post("/", response_model=DisputeModel, status_code=201)
-async def create_dispute(
+def create_dispute(
     dispute: DisputeCreate,
     db: Session = Depends(get_db),
 ):
@@ -62,58 +100,96 @@ async def create_dispute(
     return DisputeModel.model_validate(new_dispute.__dict__, strict=False)
 
 
+@router.post("/bulk", response_model=BulkIngestReport)
+async def bulk_create_disputes(request: Request, db: Session = Depends(get_db)):
+    """
+    Create disputes from a JSON array or an NDJSON stream
+    (application/x-ndjson), in chunked transactions. Customer dispute
+    counts are incremented once per customer per chunk; invalid rows and
+    unknown customers are reported per row instead of failing the request.
+    """
+    try:
+        return await ingest_disputes(db, request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def dispute_query_params(
+    status: Optional[List[str]] = Query(
+        None, description="Status filter; repeat or comma-separate for several"
+    ),
+    priority: Optional[List[str]] = Query(
+        None, description="Priority filter (1-5); repeat or comma-separate"
+    ),
+    category: Optional[List[str]] = Query(
+        None, description="Category filter; repeat or comma-separate for several"
+    ),
+    min_amount: Optional[float] = Query(None, description="Minimum amount"),
+    max_amount: Optional[float] = Query(None, description="Maximum amount"),
+    created_from: Optional[datetime] = Query(
+        None, description="Only disputes created at or after this time"
+    ),
+    created_to: Optional[datetime] = Query(
+        None, description="Only disputes created at or before this time"
+    ),
+    risk_factor: Optional[List[str]] = Query(
+        None, description="Only disputes whose insight lists this risk factor; repeat"
+    ),
+    sort: Optional[DisputeSort] = Query(
+        None, description="Ordering; overrides priority_sort and date_sort"
+    ),
+    priority_sort: bool = Query(True, description="Sort by priority (high to low)"),
+    date_sort: str = Query("desc", description="Sort by date ('asc' or 'desc')"),
+) -> Dict[str, Any]:
+    """Filter and sort parameters shared by the dispute listing and export"""
+    return {
+        "status": status,
+        "priority": priority,
+        "category": category,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "created_from": created_from,
+        "created_to": created_to,
+        "risk_factor": risk_factor,
+        "sort": sort,
+        "priority_sort": priority_sort,
+        "date_sort": date_sort,
+    }
+
+
 @router.get(
     "/",
-    response_model=List[DisputeModel],
+    response_model=List[DisputeListItem],
+    # Leaves "customer" out unless it was expanded
+    response_model_exclude_unset=True,
 )
-async def get_disputes(
+def get_disputes(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None,
-    priority: Optional[int] = None,
-    category: Optional[str] = None,
-    priority_sort: bool = Query(True, description="Sort by priority (high to low)"),
-    date_sort: str = Query("desc", description="Sort by date ('asc' or 'desc')"),
+    params: Dict[str, Any] = Depends(dispute_query_params),
+    cursor: Optional[str] = Query(
+        None,
+        description=f"Keyset cursor from the {NEXT_CURSOR_HEADER} header of the "
+        "previous page (same filters and sort); replaces skip",
+    ),
+    expand: Optional[List[str]] = Query(
+        None, description="Related objects to embed in each dispute: 'customer'"
+    ),
 ):
-    """Get all disputes with improved filtering and sorting"""
-    query = db.query(Dispute)
-
-    # Apply filters
-    if status:
-        valid_statuses = ["Open", "Under Review", "Resolved"]
-        if status not in valid_statuses:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid status filter. Must be one of: {', '.join(valid_statuses)}",
-            )
-        query = query.filter(Dispute.status == status)
-
-    if priority:
-        if not 1 <= priority <= 5:
-            raise HTTPException(
-                status_code=400, detail="Priority filter must be between 1 and 5"
-            )
-        query = query.filter(Dispute.priority == priority)
-
-    if category:
-        query = query.filter(Dispute.category == category)
-
-    # Apply sorting
-    if priority_sort:
-        # Sort by priority descending (nulls last)
-        query = query.order_by(
-            case({None: 0}, value=Dispute.priority, else_=Dispute.priority).desc()
-        )
-
-    # Apply date sorting
-    if date_sort.lower() == "asc":
-        query = query.order_by(Dispute.created_at.asc())
-    else:
-        query = query.order_by(Dispute.created_at.desc())
+    """
+    Get all disputes with improved filtering and sorting. When a full page
+    is returned, the cursor for the next one is sent in X-Next-Cursor.
+    """
+    try:
+        query = build_dispute_query(db, cursor=cursor, **params)
+        query, expansions = expand_dispute_query(query, expand)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Apply pagination with validation
-    if skip < 0:
+    if skip < 0 or cursor:
         skip = 0
     if limit <= 0:
         limit = 100
@@ -123,14 +199,70 @@ async def get_disputes(
     # Execute query with pagination
     try:
         disputes = query.offset(skip).limit(limit).all()
-        # Convert to Pydantic models
-        return [DisputeModel.model_validate(dispute.__dict__) for dispute in disputes]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database query error: {str(e)}")
 
+    keys = dispute_sort_keys(
+        params["priority_sort"], params["date_sort"], params["priority"], params["sort"]
+    )
+    cursor = next_cursor(disputes, keys, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+    # Convert to Pydantic models
+    items = []
+    for dispute in disputes:
+        data = dispute.__dict__.copy()
+        data.pop("customer", None)
+        if "customer" in expansions:
+            data["customer"] = dispute.customer.__dict__ if dispute.customer else None
+        items.append(DisputeListItem.model_validate(data))
+    return items
+
+
+@router.get("/export")
+def export_disputes(
+    db: Session = Depends(get_db),
+    params: Dict[str, Any] = Depends(dispute_query_params),
+    format: ExportFormat = Query(ExportFormat.ndjson, description="ndjson or csv"),
+    include_insights: bool = Query(
+        False, description="Join each dispute's stored AI insight"
+    ),
+):
+    """
+    Stream every dispute matching the listing filters as NDJSON or CSV, in
+    the listing's order. Memory use is constant regardless of table size.
+    """
+    try:
+        query = build_dispute_query(db, **params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        stream_export(query, format, include_insights),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="disputes.{format.value}"'
+        },
+    )
+
+
+@router.get("/analysis/metrics", response_model=dict)
+async def get_analysis_metrics():
+    """Get AI usage per mode plus cache, rate limiter and circuit breaker stats"""
+    cache = get_response_cache()
+    rate_limiter = get_rate_limiter()
+    circuit_breaker = get_circuit_breaker()
+    return {
+        "usage": usage_tracker.snapshot(),
+        "cache": cache.stats() if cache else None,
+        "rate_limiter": rate_limiter.stats() if rate_limiter else None,
+        "circuit_breaker": circuit_breaker.stats() if circuit_breaker else None,
+    }
+
 
 @router.get("/{dispute_id}", response_model=DisputeWithCustomer)
-async def get_dispute(dispute_id: str, db: Session = Depends(get_db)):
+def get_dispute(dispute_id: str, db: Session = Depends(get_db)):
     """Get a specific dispute with customer details"""
     dispute = db.query(Dispute).filter(Dispute.id == dispute_id).first()
     if not dispute:
@@ -147,8 +279,36 @@ async def get_dispute(dispute_id: str, db: Session = Depends(get_db)):
     return DisputeWithCustomer.model_validate(result)
 
 
+@router.get("/{dispute_id}/full", response_model=DisputeFull)
+def get_dispute_full(dispute_id: str, db: Session = Depends(get_db)):
+    """
+    Get a dispute with its customer, insights and notes, eager-loaded in a
+    single query so the details page needs one round trip
+    """
+    dispute = (
+        db.query(Dispute)
+        .options(
+            joinedload(Dispute.customer),
+            joinedload(Dispute.ai_insights),
+            joinedload(Dispute.notes),
+        )
+        .filter(Dispute.id == dispute_id)
+        .first()
+    )
+    if not dispute:
+        raise HTTPException(status_code=404, detail="Dispute not found")
+
+    result = dispute.__dict__.copy()
+    result["customer"] = dispute.customer.__dict__ if dispute.customer else None
+    result["notes"] = [note.__dict__ for note in dispute.notes]
+    result["insights"] = None
+    if dispute.ai_insights:
+        result["insights"] = _format_insight_response(dispute.ai_insights)
+    return DisputeFull.model_validate(result)
+
+
 @router.put("/{dispute_id}", response_model=DisputeModel)
-async def update_dispute(
+def update_dispute(
     dispute_id: str, dispute_update: DisputeUpdate, db: Session = Depends(get_db)
 ):
     """Update a dispute"""
@@ -164,11 +324,10 @@ async def update_dispute(
     # Update fields with validation
     if dispute_update.status is not None:
         # Validate status
-        valid_statuses = ["Open", "Under Review", "Resolved"]
-        if dispute_update.status not in valid_statuses:
+        if dispute_update.status not in VALID_STATUSES:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
+                detail=f"Invalid status. Must be one of: {', '.join(VALID_STATUSES)}",
             )
 
         dispute.status = dispute_update.status
@@ -200,109 +359,68 @@ async def update_dispute(
 # Just be sure to add the proper model_validate conversion in each endpoint
 
 
+@router.post("/analyze-batch")
+async def analyze_disputes_batch(
+    db: Session = Depends(get_db),
+    ai_service: DisputeAIService = Depends(get_ai_service),
+    limit: Optional[int] = Query(None, ge=1, description="Max disputes to analyze"),
+    batch_size: Optional[int] = Query(None, ge=1, le=100),
+    max_concurrency: Optional[int] = Query(None, ge=1, le=50),
+):
+    """
+    Analyze every dispute that has no insights yet, in batched LLM calls.
+    Progress is streamed back as newline-delimited JSON events.
+    """
+
+    async def progress_events():
+        async for event in run_batch_analysis(
+            db, ai_service, limit, batch_size, max_concurrency
+        ):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(progress_events(), media_type="application/x-ndjson")
+
+
 @router.post(
-    "/{dispute_id}/analyze", response_model=DisputeAnalysisResponse, status_code=201
+    "/{dispute_id}/analyze",
+    response_model=DisputeAnalysisResponse,
+    status_code=201,
+    responses={202: {"model": AnalysisJobModel}},
 )
 async def analyze_dispute(
     dispute_id: str,
     db: Session = Depends(get_db),
     ai_service: DisputeAIService = Depends(get_ai_service),
+    background: Optional[bool] = Query(
+        None,
+        description="Queue the analysis and return 202 with a job id "
+        "(defaults to ANALYSIS_BACKGROUND_DEFAULT)",
+    ),
 ):
-    # The response is already properly converted to a Pydantic model
-    # No changes needed
-    try:
-        # Get dispute from database
-        dispute = db.query(Dispute).filter(Dispute.id == dispute_id).first()
+    """Analyze a dispute with AI, either inline or as a background job"""
+    if background is None:
+        background = settings.ANALYSIS_BACKGROUND_DEFAULT
+
+    if background:
+        dispute = await run_in_threadpool(
+            lambda: db.query(Dispute).filter(Dispute.id == dispute_id).first()
+        )
         if not dispute:
             raise HTTPException(status_code=404, detail="Dispute not found")
 
-        # Check if analysis already exists
-        existing_insight = (
-            db.query(DisputeInsight)
-            .filter(DisputeInsight.dispute_id == dispute_id)
-            .first()
+        job = await analysis_queue.submit(db, dispute_id)
+        return JSONResponse(
+            status_code=202, content=jsonable_encoder(format_job_response(job))
         )
-        if existing_insight:
-            # Return existing analysis instead of creating a duplicate
-            analysis_result = {
-                "priority": existing_insight.priority_level,
-                "priority_reason": existing_insight.priority_reason,
-                "insights": existing_insight.insights,
-                "followup_questions": json.loads(existing_insight.followup_questions),
-                "probable_solutions": json.loads(existing_insight.probable_solutions),
-                "possible_reasons": json.loads(existing_insight.possible_reasons),
-                "risk_score": existing_insight.risk_score,
-                "risk_factors": json.loads(existing_insight.risk_factors),
-            }
-            response_data = {"dispute_id": dispute_id, "analysis": analysis_result}
-            return DisputeAnalysisResponse.model_validate(response_data)
-
-        # Get customer information
-        customer = db.query(Customer).filter(Customer.id == dispute.customer_id).first()
-        if not customer:
-            raise HTTPException(status_code=404, detail="Customer not found")
-
-        # Prepare data for AI analysis
-        dispute_data = {
-            "dispute_id": dispute.id,
-            "customer_id": dispute.customer_id,
-            "customer_name": customer.name,
-            "customer_type": customer.account_type,
-            "transaction_id": dispute.transaction_id,
-            "merchant_name": dispute.merchant_name,
-            "transaction_date": dispute.created_at.isoformat(),
-            "dispute_date": dispute.created_at.isoformat(),
-            "transaction_amount": dispute.amount,
-            "dispute_description": dispute.description,
-            "category": dispute.category,
-            "previous_disputes_count": customer.dispute_count,
-            "customer_account_age_days": (
-                (datetime.utcnow() - customer.created_at).days
-            ),
-            "has_supporting_documents": False,  # Example value
-        }
-
-        # Analyze dispute using AI
-        analysis_result = ai_service.analyze_dispute(dispute_data)
-
-        # Validate required fields in analysis_result
-        required_fields = [
-            "priority",
-            "priority_reason",
-            "insights",
-            "followup_questions",
-            "probable_solutions",
-            "possible_reasons",
-            "risk_score",
-            "risk_factors",
-        ]
-        for field in required_fields:
-            if field not in analysis_result:
-                raise ValueError(f"AI analysis missing required field: {field}")
-
-        # Update dispute with priority (from analysis_result, not directly setting it)
-        dispute.priority = analysis_result["priority"]
-        db.commit()
 
-        # Store AI insights with proper field validation
-        insight = DisputeInsight(
-            id=str(uuid.uuid4()),
-            dispute_id=dispute_id,
-            priority_level=analysis_result["priority"],
-            priority_reason=analysis_result["priority_reason"],
-            insights=analysis_result["insights"],
-            followup_questions=json.dumps(analysis_result["followup_questions"]),
-            probable_solutions=json.dumps(analysis_result["probable_solutions"]),
-            possible_reasons=json.dumps(analysis_result["possible_reasons"]),
-            risk_score=analysis_result["risk_score"],
-            risk_factors=json.dumps(analysis_result["risk_factors"]),
-        )
-        db.add(insight)
-        db.commit()
+    try:
+        analysis_result = await analyze_and_store(db, dispute_id, ai_service)
 
         # Return analysis results
         response_data = {"dispute_id": dispute_id, "analysis": analysis_result}
         return DisputeAnalysisResponse.model_validate(response_data)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         # Handle missing fields in AI response
         raise HTTPException(status_code=400, detail=str(e))
@@ -315,8 +433,49 @@ async def analyze_dispute(
         raise HTTPException(status_code=500, detail=f"AI analysis failed: {str(e)}")
 
 
+@router.get("/{dispute_id}/analyze/stream")
+async def stream_dispute_analysis(
+    dispute_id: str,
+    db: Session = Depends(get_db),
+    ai_service: DisputeAIService = Depends(get_ai_service),
+):
+    """
+    Analyze a dispute with AI, streaming each stage as Server-Sent Events:
+    ``risk`` (rule-based, immediately), ``priority``, ``insights_token`` and
+    finally ``analysis`` once the insight is stored. Failures are sent as an
+    ``error`` event.
+    """
+    try:
+        dispute, customer, existing_insight = await run_in_threadpool(
+            get_analysis_context, db, dispute_id
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    async def sse_events():
+        try:
+            async for event, data in stream_analysis(
+                db, dispute, customer, existing_insight, ai_service
+            ):
+                yield _format_sse(event, data)
+        except Exception as e:
+            logger.exception("AI analysis stream failed for dispute %s", dispute_id)
+            yield _format_sse("error", {"detail": f"AI analysis failed: {str(e)}"})
+
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.delete("/{dispute_id}", response_model=dict)
-async def delete_dispute(dispute_id: str, db: Session = Depends(get_db)):
+def delete_dispute(dispute_id: str, db: Session = Depends(get_db)):
     """Delete a dispute"""
     dispute = db.query(Dispute).filter(Dispute.id == dispute_id).first()
     if not dispute:
@@ -343,7 +502,7 @@ from app.api.models import Insights, InsightsCreate
 
 
 @router.post("/{dispute_id}/insights", response_model=Insights, status_code=201)
-async def create_dispute_insights(
+def create_dispute_insights(
     dispute_id: str,
     insight_data: InsightsCreate,
     db: Session = Depends(get_db),
@@ -376,16 +535,16 @@ async def create_dispute_insights(
         )
 
     try:
-        # Create new insight with proper JSON serialization
+        # Create new insight
         new_insight = DisputeInsight(
             id=str(uuid.uuid4()),
             dispute_id=dispute_id,
             insights=insight_data.insights,
-            followup_questions=json.dumps(insight_data.followup_questions),
-            probable_solutions=json.dumps(insight_data.probable_solutions),
-            possible_reasons=json.dumps(insight_data.possible_reasons),
+            followup_questions=insight_data.followup_questions,
+            probable_solutions=insight_data.probable_solutions,
+            possible_reasons=insight_data.possible_reasons,
             risk_score=insight_data.risk_score,
-            risk_factors=json.dumps(insight_data.risk_factors),
+            risk_factors=insight_data.risk_factors,
             priority_level=insight_data.priority_level,
             priority_reason=insight_data.priority_reason,
         )
@@ -400,6 +559,12 @@ async def create_dispute_insights(
 
         # Return formatted response
         return _format_insight_response(new_insight)
+    except IntegrityError:
+        # Stored concurrently since the check above
+        db.rollback()
+        raise HTTPException(
+            status_code=400, detail="Insights already exist for this dispute"
+        )
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -408,7 +573,7 @@ async def create_dispute_insights(
 
 
 @router.get("/{dispute_id}/insights", response_model=Insights)
-async def get_dispute_insights(dispute_id: str, db: Session = Depends(get_db)):
+def get_dispute_insights(dispute_id: str, db: Session = Depends(get_db)):
     """Get insights for a specific dispute"""
     # Check if dispute exists
     dispute = db.query(Dispute).filter(Dispute.id == dispute_id).first()
@@ -424,32 +589,11 @@ async def get_dispute_insights(dispute_id: str, db: Session = Depends(get_db)):
             status_code=404, detail="No insights found for this dispute"
         )
 
-    # Handle potentially malformed JSON with more detailed error messages
-    try:
-        return _format_insight_response(insight)
-    except json.JSONDecodeError as e:
-        # Log the specific JSON error
-        print(f"JSON decode error in dispute insights: {str(e)}")
-        # Create a response with empty lists for fields that failed to parse
-        insight_data = {
-            "id": insight.id,
-            "dispute_id": insight.dispute_id,
-            "insights": insight.insights,
-            "followup_questions": [],
-            "probable_solutions": [],
-            "possible_reasons": [],
-            "risk_score": insight.risk_score,
-            "risk_factors": [],
-            "priority_level": insight.priority_level,
-            "priority_reason": insight.priority_reason,
-            "created_at": insight.created_at,
-            "updated_at": insight.updated_at,
-        }
-        return Insights.model_validate(insight_data)
+    return _format_insight_response(insight)
 
 
 @router.put("/{dispute_id}/insights", response_model=Insights)
-async def update_dispute_insights(
+def update_dispute_insights(
     dispute_id: str, insight_data: InsightsCreate, db: Session = Depends(get_db)
 ):
     """Update insights for a specific dispute"""
@@ -469,37 +613,39 @@ async def update_dispute_insights(
 
     # Update fields
     insight.insights = insight_data.insights
-    insight.followup_questions = json.dumps(insight_data.followup_questions)
-    insight.probable_solutions = json.dumps(insight_data.probable_solutions)
-    insight.possible_reasons = json.dumps(insight_data.possible_reasons)
+    insight.followup_questions = insight_data.followup_questions
+    insight.probable_solutions = insight_data.probable_solutions
+    insight.possible_reasons = insight_data.possible_reasons
     insight.risk_score = insight_data.risk_score
-    insight.risk_factors = json.dumps(insight_data.risk_factors)
+    insight.risk_factors = insight_data.risk_factors
     insight.priority_level = insight_data.priority_level
     insight.priority_reason = insight_data.priority_reason
+    insight.is_provisional = False
 
     # Commit changes
     db.commit()
     db.refresh(insight)
 
-    # Convert the stored JSON strings back to lists for the response
     return _format_insight_response(insight)
 
 
 # Helper function to format insight response
 def _format_insight_response(insight):
-    """Convert SQLAlchemy model to Pydantic model with JSON parsing"""
+    """Convert SQLAlchemy model to Pydantic model"""
     insight_data = {
         "id": insight.id,
         "dispute_id": insight.dispute_id,
         "insights": insight.insights,
-        "followup_questions": json.loads(insight.followup_questions),
-        "probable_solutions": json.loads(insight.probable_solutions),
-        "possible_reasons": json.loads(insight.possible_reasons),
+        "followup_questions": insight.followup_questions,
+        "probable_solutions": insight.probable_solutions,
+        "possible_reasons": insight.possible_reasons,
         "risk_score": insight.risk_score,
-        "risk_factors": json.loads(insight.risk_factors),
+        "risk_factors": insight.risk_factors,
         "priority_level": insight.priority_level,
         "priority_reason": insight.priority_reason,
+        "is_provisional": insight.is_provisional,
         "created_at": insight.created_at,
         "updated_at": insight.updated_at if hasattr(insight, "updated_at") else None,
     }
     return Insights.model_validate(insight_data)
+
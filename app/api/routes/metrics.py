@@ -0,0 +1,15 @@
+# app/api/routes/metrics.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api.database import get_db
+from app.api.models import DashboardMetrics
+from app.api.services.metrics_service import read_dashboard_metrics
+
+router = APIRouter()
+
+
+@router.get("/dashboard", response_model=DashboardMetrics)
+def get_dashboard_metrics(db: Session = Depends(get_db)):
+    """Get dispute totals and breakdowns for the dashboard"""
+    return DashboardMetrics.model_validate(read_dashboard_metrics(db))
@@ -0,0 +1,42 @@
+# app/api/routes/snapshots.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.database import get_db
+from app.api.services.snapshot_export import (
+    SNAPSHOT_MEDIA_TYPES,
+    SNAPSHOT_TABLES,
+    SnapshotFormat,
+    stream_snapshot,
+)
+
+router = APIRouter()
+
+
+@router.get("/{table_name}")
+def get_snapshot(
+    table_name: str,
+    db: Session = Depends(get_db),
+    format: SnapshotFormat = Query(
+        SnapshotFormat.parquet, description="parquet or arrow (Arrow IPC file)"
+    ),
+):
+    """
+    Stream a columnar snapshot of disputes, customers or dispute_insights,
+    written one row group at a time
+    """
+    if table_name not in SNAPSHOT_TABLES:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown table. Must be one of: {', '.join(SNAPSHOT_TABLES)}",
+        )
+
+    extension = "parquet" if format == SnapshotFormat.parquet else "arrow"
+    return StreamingResponse(
+        stream_snapshot(db, table_name, format),
+        media_type=SNAPSHOT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{table_name}.{extension}"'
+        },
+    )
@@ -0,0 +1,163 @@
+# app/api/services/analysis_queue.py
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.database import SessionLocal, AnalysisJob
+from app.api.services.analysis_service import analyze_and_store
+from app.ai.client_pool import ai_service_pool
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Analysis job statuses
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class AnalysisJobQueue:
+    """In-process analysis job queue backed by the analysis_jobs table.
+
+    Jobs are persisted before being queued, so anything still queued or
+    running when the process stops is picked up again on the next start.
+    """
+
+    def __init__(self, workers: Optional[int] = None, session_factory=SessionLocal):
+        self.workers = max(1, workers or settings.ANALYSIS_WORKERS)
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Recover unfinished jobs and start the worker tasks"""
+        if self.started:
+            return
+
+        self._queue = asyncio.Queue()
+
+        db = self.session_factory()
+        try:
+            pending = (
+                db.query(AnalysisJob)
+                .filter(AnalysisJob.status.in_([JOB_QUEUED, JOB_RUNNING]))
+                .order_by(AnalysisJob.created_at)
+                .all()
+            )
+            for job in pending:
+                # Jobs left running were interrupted by a shutdown
+                job.status = JOB_QUEUED
+                self._queue.put_nowait(job.id)
+            db.commit()
+        finally:
+            db.close()
+
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; unfinished jobs stay persisted"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def submit(self, db: Session, dispute_id: str) -> AnalysisJob:
+        """
+        Persist a new job on the DB thread pool, then hand it to the workers
+        if they are running. The asyncio queue is only touched on the loop.
+        """
+        job = await run_in_threadpool(self.create_job, db, dispute_id)
+        if self._queue is not None:
+            self._queue.put_nowait(job.id)
+        return job
+
+    @staticmethod
+    def create_job(db: Session, dispute_id: str) -> AnalysisJob:
+        """Persist a queued job without handing it to the workers"""
+        job = AnalysisJob(
+            id=str(uuid.uuid4()), dispute_id=dispute_id, status=JOB_QUEUED
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception:
+                logger.exception("Analysis job %s crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str) -> None:
+        db = self.session_factory()
+        try:
+            job = await run_in_threadpool(self._claim_job, db, job_id)
+            if job is None:
+                return
+
+            try:
+                result = await analyze_and_store(
+                    db, job.dispute_id, ai_service_pool.acquire()
+                )
+                outcome = (JOB_COMPLETED, json.dumps(result), None)
+            except Exception as e:
+                outcome = (JOB_FAILED, None, str(e))
+
+            await run_in_threadpool(self._finish_job, db, job, *outcome)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claim_job(db: Session, job_id: str) -> Optional[AnalysisJob]:
+        """Mark a queued job as running; None if it no longer needs to run"""
+        job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+        if not job or job.status != JOB_QUEUED:
+            return None
+
+        job.status = JOB_RUNNING
+        job.started_at = datetime.utcnow()
+        job.attempts += 1
+        db.commit()
+        return job
+
+    @staticmethod
+    def _finish_job(
+        db: Session,
+        job: AnalysisJob,
+        status: str,
+        result: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        if status == JOB_FAILED:
+            db.rollback()
+        job.status = status
+        job.result = result
+        job.error = error
+        job.completed_at = datetime.utcnow()
+        db.commit()
+
+
+# Shared queue started/stopped with the FastAPI app
+analysis_queue = AnalysisJobQueue()
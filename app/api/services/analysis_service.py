@@ -0,0 +1,258 @@
+# app/api/services/analysis_service.py
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.database import Customer, Dispute, DisputeInsight
+from app.api.services.priority_service import PriorityService
+from app.ai.circuit_breaker import LLMUnavailableError
+from app.ai.dispute_analyzer import DisputeAnalyzer
+from app.ai.langchain_service import DisputeAIService
+
+# Fields every analysis result must provide before it can be stored
+REQUIRED_ANALYSIS_FIELDS = [
+    "priority",
+    "priority_reason",
+    "insights",
+    "followup_questions",
+    "probable_solutions",
+    "possible_reasons",
+    "risk_score",
+    "risk_factors",
+]
+
+
+def build_dispute_data(dispute: Dispute, customer: Customer) -> Dict[str, Any]:
+    """Prepare the dispute/customer context passed to the AI service"""
+    return {
+        "dispute_id": dispute.id,
+        "customer_id": dispute.customer_id,
+        "customer_name": customer.name,
+        "customer_type": customer.account_type,
+        "transaction_id": dispute.transaction_id,
+        "merchant_name": dispute.merchant_name,
+        "transaction_date": dispute.created_at.isoformat(),
+        "dispute_date": dispute.created_at.isoformat(),
+        "transaction_amount": dispute.amount,
+        "dispute_description": dispute.description,
+        "category": dispute.category,
+        "previous_disputes_count": customer.dispute_count,
+        "customer_account_age_days": (
+            (datetime.utcnow() - customer.created_at).days
+        ),
+        "has_supporting_documents": False,  # Example value
+    }
+
+
+def format_stored_analysis(insight: DisputeInsight) -> Dict[str, Any]:
+    """Convert a stored DisputeInsight back into an analysis result dict"""
+    return {
+        "priority": insight.priority_level,
+        "priority_reason": insight.priority_reason,
+        "insights": insight.insights,
+        "followup_questions": insight.followup_questions,
+        "probable_solutions": insight.probable_solutions,
+        "possible_reasons": insight.possible_reasons,
+        "risk_score": insight.risk_score,
+        "risk_factors": insight.risk_factors,
+        "provisional": insight.is_provisional,
+    }
+
+
+def rule_based_analysis(dispute_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Provisional analysis from rule-based risk scoring, used when the LLM is
+    unavailable (circuit open or timed out)
+    """
+    risk_score, risk_factors = DisputeAnalyzer._calculate_risk_score(dispute_data)
+    return {
+        "priority": PriorityService._risk_based_priority(risk_score),
+        "priority_reason": (
+            f"Provisional rule-based priority (risk score {risk_score}/100) "
+            "assigned while AI analysis was unavailable"
+        ),
+        "insights": (
+            "Provisional analysis based on rule-based risk scoring. "
+            "AI insights will replace it once the AI service is available."
+        ),
+        "followup_questions": [],
+        "probable_solutions": [],
+        "possible_reasons": [],
+        # Rule-based scores are 0-100, stored insights use 0-10
+        "risk_score": round(risk_score / 10, 2),
+        "risk_factors": risk_factors,
+        "provisional": True,
+    }
+
+
+def build_insight(
+    dispute: Dispute,
+    analysis_result: Dict[str, Any],
+    insight: Optional[DisputeInsight] = None,
+) -> DisputeInsight:
+    """
+    Validate an analysis result, apply its priority to the dispute and return
+    the DisputeInsight row for it: ``insight`` updated in place when given
+    (upgrading a provisional insight), otherwise a new unsaved row
+    """
+    for field in REQUIRED_ANALYSIS_FIELDS:
+        if field not in analysis_result:
+            raise ValueError(f"AI analysis missing required field: {field}")
+
+    # Update dispute with priority (from analysis_result, not directly setting it)
+    dispute.priority = analysis_result["priority"]
+
+    if insight is None:
+        insight = DisputeInsight(id=str(uuid.uuid4()), dispute_id=dispute.id)
+
+    insight.priority_level = analysis_result["priority"]
+    insight.priority_reason = analysis_result["priority_reason"]
+    insight.insights = analysis_result["insights"]
+    insight.followup_questions = analysis_result["followup_questions"]
+    insight.probable_solutions = analysis_result["probable_solutions"]
+    insight.possible_reasons = analysis_result["possible_reasons"]
+    insight.risk_score = analysis_result["risk_score"]
+    insight.risk_factors = analysis_result["risk_factors"]
+    insight.is_provisional = bool(analysis_result.get("provisional", False))
+    return insight
+
+
+def save_analysis(
+    db: Session,
+    dispute: Dispute,
+    analysis_result: Dict[str, Any],
+    insight: Optional[DisputeInsight] = None,
+) -> DisputeInsight:
+    """
+    Validate an analysis result and store it as the dispute's insight. If a
+    concurrent analysis (the analyze route and a queued job) stored one
+    first, that row is updated instead of failing on the unique dispute_id
+    """
+    insight = build_insight(dispute, analysis_result, insight)
+    db.add(insight)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        stored = (
+            db.query(DisputeInsight)
+            .filter(DisputeInsight.dispute_id == dispute.id)
+            .first()
+        )
+        if stored is None or stored is insight:
+            raise
+        insight = build_insight(dispute, analysis_result, stored)
+        db.commit()
+    return insight
+
+
+def get_analysis_context(
+    db: Session, dispute_id: str
+) -> Tuple[Dispute, Customer, Optional[DisputeInsight]]:
+    """
+    Load a dispute, its customer and its existing insight (if any).
+    Raises LookupError if the dispute or its customer does not exist.
+    """
+    dispute = db.query(Dispute).filter(Dispute.id == dispute_id).first()
+    if not dispute:
+        raise LookupError("Dispute not found")
+
+    customer = db.query(Customer).filter(Customer.id == dispute.customer_id).first()
+    if not customer:
+        raise LookupError("Customer not found")
+
+    existing_insight = (
+        db.query(DisputeInsight).filter(DisputeInsight.dispute_id == dispute_id).first()
+    )
+    return dispute, customer, existing_insight
+
+
+async def analyze_and_store(
+    db: Session, dispute_id: str, ai_service: DisputeAIService
+) -> Dict[str, Any]:
+    """
+    Run AI analysis for a dispute and persist the resulting insight.
+
+    Returns the stored analysis unchanged if the dispute was already analyzed;
+    a provisional insight is upgraded when the AI service is available again.
+    If the LLM is unavailable, a provisional rule-based analysis is stored.
+    Raises LookupError if the dispute or its customer does not exist and
+    ValueError if the AI response is missing required fields. Database work
+    runs on the DB thread pool so the event loop stays free during queries.
+    """
+    dispute, customer, existing_insight = await run_in_threadpool(
+        get_analysis_context, db, dispute_id
+    )
+
+    # Return existing analysis instead of creating a duplicate
+    if existing_insight and not existing_insight.is_provisional:
+        return format_stored_analysis(existing_insight)
+
+    dispute_data = build_dispute_data(dispute, customer)
+    try:
+        # Analyze dispute using AI (priority and insights run concurrently)
+        analysis_result = await ai_service.aanalyze_dispute(dispute_data)
+    except LLMUnavailableError as e:
+        if existing_insight:
+            # Keep the provisional insight until the AI service recovers
+            return format_stored_analysis(existing_insight)
+        analysis_result = rule_based_analysis(dispute_data)
+        analysis_result["fallback_reason"] = str(e)
+
+    await run_in_threadpool(
+        save_analysis, db, dispute, analysis_result, existing_insight
+    )
+    return analysis_result
+
+
+async def stream_analysis(
+    db: Session,
+    dispute: Dispute,
+    customer: Customer,
+    existing_insight: Optional[DisputeInsight],
+    ai_service: DisputeAIService,
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Analyze a dispute as a stream of (event, data) pairs and persist the result.
+
+    Emits ``risk`` (rule-based, immediately), then the AI service's
+    ``priority`` and ``insights_token`` events, and ``analysis`` once the
+    insight is stored. An existing full analysis is sent as a single
+    ``analysis`` event. Falls back like analyze_and_store when the LLM is
+    unavailable.
+    """
+    if existing_insight and not existing_insight.is_provisional:
+        yield "analysis", format_stored_analysis(existing_insight)
+        return
+
+    dispute_data = build_dispute_data(dispute, customer)
+    fallback = rule_based_analysis(dispute_data)
+    yield "risk", {
+        "priority": fallback["priority"],
+        "risk_score": fallback["risk_score"],
+        "risk_factors": fallback["risk_factors"],
+        "provisional": True,
+    }
+
+    try:
+        async for event, data in ai_service.astream_analysis(dispute_data):
+            if event == "analysis":
+                analysis_result = data
+            else:
+                yield event, data
+    except LLMUnavailableError as e:
+        if existing_insight:
+            # Keep the provisional insight until the AI service recovers
+            yield "analysis", format_stored_analysis(existing_insight)
+            return
+        analysis_result = fallback
+        analysis_result["fallback_reason"] = str(e)
+
+    await run_in_threadpool(
+        save_analysis, db, dispute, analysis_result, existing_insight
+    )
+    yield "analysis", analysis_result
@@ -0,0 +1,170 @@
+# app/api/services/batch_analysis.py
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.database import Customer, Dispute, DisputeInsight
+from app.api.services.analysis_service import (
+    build_dispute_data,
+    build_insight,
+    rule_based_analysis,
+    save_analysis,
+)
+from app.ai.circuit_breaker import LLMUnavailableError
+from app.ai.langchain_service import DisputeAIService
+from app.core.config import settings
+
+
+def get_unanalyzed_disputes(db: Session, limit: Optional[int] = None) -> List[tuple]:
+    """
+    Return (dispute, customer, insight) rows for disputes without a full AI
+    analysis: no DisputeInsight at all (insight is None) or a provisional one
+    """
+    query = (
+        db.query(Dispute, Customer, DisputeInsight)
+        .join(Customer, Customer.id == Dispute.customer_id)
+        .outerjoin(DisputeInsight, DisputeInsight.dispute_id == Dispute.id)
+        .filter(
+            (DisputeInsight.id.is_(None)) | (DisputeInsight.is_provisional.is_(True))
+        )
+        .order_by(Dispute.created_at.asc())
+    )
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def load_dispute_batch(db: Session, dispute_ids: List[str]) -> List[tuple]:
+    """
+    Reload (dispute, customer, insight) rows for ``dispute_ids`` in one joined
+    query, in the given order. Each batch commit expires every loaded row, so
+    re-querying per batch refreshes them together instead of one lazy load
+    per attribute access.
+    """
+    rows = (
+        db.query(Dispute, Customer, DisputeInsight)
+        .join(Customer, Customer.id == Dispute.customer_id)
+        .outerjoin(DisputeInsight, DisputeInsight.dispute_id == Dispute.id)
+        .filter(Dispute.id.in_(dispute_ids))
+        .all()
+    )
+    position = {dispute_id: i for i, dispute_id in enumerate(dispute_ids)}
+    return sorted(rows, key=lambda row: position[row[0].id])
+
+
+async def run_batch_analysis(
+    db: Session,
+    ai_service: DisputeAIService,
+    limit: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyze every unanalyzed dispute in LLM batches, yielding progress events.
+
+    Each batch is sent through DisputeAIService.abatch_analyze_disputes and
+    its insights are written in a single transaction. Disputes whose LLM call
+    is refused by the circuit breaker get a provisional rule-based insight.
+    """
+    batch_size = max(1, batch_size or settings.BATCH_ANALYSIS_SIZE)
+    max_concurrency = max(1, max_concurrency or settings.BATCH_ANALYSIS_CONCURRENCY)
+
+    pending = await run_in_threadpool(get_unanalyzed_disputes, db, limit)
+    pending_ids = [dispute.id for dispute, _, _ in pending]
+    total = len(pending_ids)
+    processed = succeeded = 0
+    failures = []
+
+    yield {"event": "started", "total": total}
+
+    for start in range(0, total, batch_size):
+        batch_ids = pending_ids[start : start + batch_size]
+        batch = await run_in_threadpool(load_dispute_batch, db, batch_ids)
+        dispute_data = [
+            build_dispute_data(dispute, customer) for dispute, customer, _ in batch
+        ]
+        results = await ai_service.abatch_analyze_disputes(
+            dispute_data, max_concurrency
+        )
+
+        succeeded += await run_in_threadpool(
+            store_batch_results, db, batch, dispute_data, results, failures
+        )
+        processed += len(batch_ids)
+        yield {
+            "event": "progress",
+            "total": total,
+            "processed": processed,
+            "succeeded": succeeded,
+            "failed": len(failures),
+        }
+
+    yield {
+        "event": "completed",
+        "total": total,
+        "processed": processed,
+        "succeeded": succeeded,
+        "failed": len(failures),
+        "failures": failures,
+    }
+
+
+def store_batch_results(
+    db: Session,
+    batch: List[tuple],
+    dispute_data: List[Dict[str, Any]],
+    results: List[Any],
+    failures: List[Dict[str, str]],
+) -> int:
+    """
+    Write a batch's insights in a single transaction, appending per-dispute
+    errors to ``failures``; if the commit fails, every dispute in the batch
+    is reported as failed. Returns the number of insights stored.
+    """
+    insights = []
+    analyzed = []
+    rows = zip(batch, dispute_data, results)
+    for (dispute, _, existing), data, result in rows:
+        try:
+            if isinstance(result, LLMUnavailableError) and existing is None:
+                result = rule_based_analysis(data)
+            if isinstance(result, Exception):
+                raise result
+            insights.append(build_insight(dispute, result, existing))
+            analyzed.append((dispute, result, existing))
+        except Exception as e:
+            failures.append({"dispute_id": dispute.id, "error": str(e)})
+
+    # Read before committing: after a failed commit the rows are expired
+    # and reloading them may fail too
+    analyzed_ids = [dispute.id for dispute, _, _ in analyzed]
+
+    # One transaction per batch instead of one commit per dispute
+    db.add_all(insights)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another analysis stored some of these insights meanwhile: store
+        # them one at a time, updating the rows that already exist
+        db.rollback()
+        stored = 0
+        for dispute, result, existing in analyzed:
+            try:
+                save_analysis(db, dispute, result, existing)
+                stored += 1
+            except Exception as e:
+                db.rollback()
+                failures.append({"dispute_id": dispute.id, "error": str(e)})
+        return stored
+    except Exception as e:
+        # Report the whole batch as failed and keep the session usable,
+        # rather than cutting the progress stream off mid-response
+        db.rollback()
+        failures.extend(
+            {"dispute_id": dispute_id, "error": f"Failed to store insight: {e}"}
+            for dispute_id in analyzed_ids
+        )
+        return 0
+    return len(insights)
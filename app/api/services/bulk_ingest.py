@@ -0,0 +1,233 @@
+# app/api/services/bulk_ingest.py
+"""
+Bulk creation of customers and disputes from a JSON array or an NDJSON
+stream.
+
+Rows are validated and inserted in chunks of BULK_CHUNK_SIZE, one
+transaction per chunk, with executemany inserts instead of a flush per
+object. A row that fails validation is reported and skipped; a chunk whose
+transaction fails reports all of its rows as errors.
+"""
+import json
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.database import (
+    Customer,
+    Dispute,
+    apply_stat_deltas,
+    dispute_stat_deltas,
+    merge_stat_deltas,
+)
+from app.api.models import CustomerCreate, DisputeCreate
+from app.core.config import settings
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+
+# (position in the request, parsed row or the reason it could not be parsed)
+Row = Tuple[int, Any]
+
+
+class _UnparsableRow:
+    def __init__(self, error: str):
+        self.error = error
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return _UnparsableRow(f"Invalid JSON: {e}")
+
+
+async def iter_request_rows(request: Request) -> AsyncIterator[Any]:
+    """
+    Yield the rows of a bulk request body. NDJSON bodies are parsed line by
+    line as they arrive; anything else must be a JSON array. Raises
+    ValueError if a JSON array body is malformed.
+    """
+    content_type = request.headers.get("content-type", "")
+    if any(media_type in content_type for media_type in NDJSON_MEDIA_TYPES):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _parse_line(line)
+        if buffer.strip():
+            yield _parse_line(buffer)
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON body: {e}")
+    if not isinstance(rows, list):
+        raise ValueError("Expected a JSON array or an NDJSON stream")
+    for row in rows:
+        yield row
+
+
+def _error(index: int, message: str) -> Dict[str, Any]:
+    return {"index": index, "status": "error", "error": message}
+
+
+def _validate(rows: List[Row], model) -> Tuple[List[Tuple[int, Any]], List[Dict]]:
+    valid, errors = [], []
+    for index, row in rows:
+        if isinstance(row, _UnparsableRow):
+            errors.append(_error(index, row.error))
+            continue
+        try:
+            valid.append((index, model.model_validate(row)))
+        except ValidationError as e:
+            errors.append(_error(index, str(e.errors(include_url=False))))
+    return valid, errors
+
+
+def _insert_chunk(db: Session, store, valid: List[Tuple[int, Any]]) -> List[Dict]:
+    """Run ``store`` in one transaction; on failure every row is an error"""
+    try:
+        results = store(db, valid)
+        db.commit()
+        return results
+    except SQLAlchemyError as e:
+        db.rollback()
+        return [_error(index, f"Database error: {e}") for index, _ in valid]
+
+
+def _store_customers(
+    db: Session, valid: List[Tuple[int, CustomerCreate]]
+) -> List[Dict]:
+    emails = {customer.email for _, customer in valid}
+    taken = {
+        email
+        for (email,) in db.query(Customer.email).filter(Customer.email.in_(emails))
+    }
+
+    results, mappings = [], []
+    for index, customer in valid:
+        if customer.email in taken:
+            results.append(_error(index, "Email already registered"))
+            continue
+        taken.add(customer.email)  # also rejects repeats within the request
+        customer_id = str(uuid.uuid4())
+        mappings.append(
+            {
+                "id": customer_id,
+                "name": customer.name,
+                "email": customer.email,
+                "account_type": customer.account_type,
+                "dispute_count": 0,
+                "created_at": datetime.utcnow(),
+            }
+        )
+        results.append({"index": index, "status": "created", "id": customer_id})
+
+    db.bulk_insert_mappings(Customer, mappings)
+    return results
+
+
+def _store_disputes(
+    db: Session, valid: List[Tuple[int, DisputeCreate]]
+) -> List[Dict]:
+    customer_ids = {dispute.customer_id for _, dispute in valid}
+    known = {
+        customer_id
+        for (customer_id,) in db.query(Customer.id).filter(
+            Customer.id.in_(customer_ids)
+        )
+    }
+
+    results, mappings = [], []
+    new_disputes: Dict[str, int] = {}
+    stat_deltas: Dict[tuple, list] = {}
+    for index, dispute in valid:
+        if dispute.customer_id not in known:
+            results.append(_error(index, "Customer not found"))
+            continue
+        mapping = {
+            "id": str(uuid.uuid4()),
+            "customer_id": dispute.customer_id,
+            "transaction_id": dispute.transaction_id,
+            "merchant_name": dispute.merchant_name,
+            "amount": dispute.amount,
+            "description": dispute.description,
+            "category": dispute.category,
+            "status": "Open",
+            "priority": None,
+            "created_at": datetime.utcnow(),
+            "resolved_at": None,
+        }
+        mappings.append(mapping)
+        added = new_disputes.get(dispute.customer_id, 0)
+        new_disputes[dispute.customer_id] = added + 1
+        merge_stat_deltas(stat_deltas, dispute_stat_deltas(mapping))
+        results.append({"index": index, "status": "created", "id": mapping["id"]})
+
+    if mappings:
+        db.bulk_insert_mappings(Dispute, mappings)
+        # One increment per customer rather than per dispute
+        customers = Customer.__table__
+        db.connection().execute(
+            update(customers)
+            .where(customers.c.id == bindparam("customer_id"))
+            .values(dispute_count=customers.c.dispute_count + bindparam("added")),
+            [
+                {"customer_id": customer_id, "added": added}
+                for customer_id, added in new_disputes.items()
+            ],
+        )
+        # Bulk inserts skip the flush hook that maintains dispute_stats
+        apply_stat_deltas(db.connection(), stat_deltas)
+    return results
+
+
+def _ingest_chunk(db: Session, rows: List[Row], model, store) -> List[Dict]:
+    valid, results = _validate(rows, model)
+    if valid:
+        results.extend(_insert_chunk(db, store, valid))
+    return sorted(results, key=lambda result: result["index"])
+
+
+async def _ingest(db: Session, request: Request, model, store) -> Dict[str, Any]:
+    results: List[Dict] = []
+    chunk: List[Row] = []
+    index = 0
+    async for row in iter_request_rows(request):
+        chunk.append((index, row))
+        index += 1
+        if len(chunk) >= settings.BULK_CHUNK_SIZE:
+            results.extend(
+                await run_in_threadpool(_ingest_chunk, db, chunk, model, store)
+            )
+            chunk = []
+    if chunk:
+        results.extend(await run_in_threadpool(_ingest_chunk, db, chunk, model, store))
+
+    created = sum(1 for result in results if result["status"] == "created")
+    return {
+        "total": len(results),
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
+
+
+async def ingest_customers(db: Session, request: Request) -> Dict[str, Any]:
+    """Create customers from a bulk request; returns the per-row report"""
+    return await _ingest(db, request, CustomerCreate, _store_customers)
+
+
+async def ingest_disputes(db: Session, request: Request) -> Dict[str, Any]:
+    """Create disputes from a bulk request; returns the per-row report"""
+    return await _ingest(db, request, DisputeCreate, _store_disputes)
@@ -0,0 +1,144 @@
+# app/api/services/dispute_export.py
+"""
+Streaming export of the disputes listing as NDJSON or CSV.
+
+Rows are read with yield_per, so the database driver hands them over in
+fixed-size batches and memory stays constant regardless of table size, and
+serialized rows are coalesced into chunks of about EXPORT_CHUNK_BYTES so a
+StreamingResponse doesn't pay a thread hop per row.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy.orm import Query
+
+from app.api.database import Dispute, DisputeInsight
+from app.core.config import settings
+
+# Serialized bytes buffered before a chunk is sent
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+DISPUTE_COLUMNS = [
+    Dispute.id,
+    Dispute.customer_id,
+    Dispute.transaction_id,
+    Dispute.merchant_name,
+    Dispute.amount,
+    Dispute.description,
+    Dispute.category,
+    Dispute.status,
+    Dispute.priority,
+    Dispute.created_at,
+    Dispute.resolved_at,
+]
+
+# Exported with an "insight_" prefix when insights are included
+INSIGHT_COLUMNS = [
+    DisputeInsight.insights,
+    DisputeInsight.followup_questions,
+    DisputeInsight.probable_solutions,
+    DisputeInsight.possible_reasons,
+    DisputeInsight.risk_score,
+    DisputeInsight.risk_factors,
+    DisputeInsight.priority_level,
+    DisputeInsight.priority_reason,
+    DisputeInsight.is_provisional,
+]
+
+
+def export_fields(include_insights: bool = False) -> List[str]:
+    fields = [column.key for column in DISPUTE_COLUMNS]
+    if include_insights:
+        fields += [f"insight_{column.key}" for column in INSIGHT_COLUMNS]
+    return fields
+
+
+def export_rows(query: Query, include_insights: bool = False) -> Iterator[Dict]:
+    """
+    Stream the rows of a build_dispute_query query as dicts, reading only
+    the exported columns (no ORM objects) in batches of EXPORT_YIELD_PER
+    """
+    columns = list(DISPUTE_COLUMNS)
+    if include_insights:
+        query = query.outerjoin(
+            DisputeInsight, DisputeInsight.dispute_id == Dispute.id
+        )
+        columns += INSIGHT_COLUMNS
+    fields = export_fields(include_insights)
+    rows = query.with_entities(*columns).yield_per(settings.EXPORT_YIELD_PER)
+    for row in rows:
+        yield dict(zip(fields, row))
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _csv_value(value: Any) -> Any:
+    return json.dumps(value) if isinstance(value, list) else _json_value(value)
+
+
+def _chunked(lines: Iterator[str]) -> Iterator[str]:
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_ndjson(rows: Iterator[Dict]) -> Iterator[str]:
+    """One JSON object per line; insight lists are decoded into arrays"""
+
+    def lines():
+        for row in rows:
+            record = {field: _json_value(value) for field, value in row.items()}
+            yield json.dumps(record) + "\n"
+
+    return _chunked(lines())
+
+
+def iter_csv(rows: Iterator[Dict], fields: List[str]) -> Iterator[str]:
+    """CSV with a header row; insight lists stay JSON-encoded"""
+
+    def lines():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {field: _csv_value(value) for field, value in row.items()}
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+
+    return _chunked(lines())
+
+
+def stream_export(
+    query: Query, export_format: ExportFormat, include_insights: bool = False
+) -> Iterator[str]:
+    rows = export_rows(query, include_insights)
+    if export_format == ExportFormat.csv:
+        return iter_csv(rows, export_fields(include_insights))
+    return iter_ndjson(rows)
@@ -0,0 +1,186 @@
+# app/api/services/dispute_query.py
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import exists, func, join, true
+from sqlalchemy.orm import Query, Session, selectinload
+
+from app.api.database import Dispute, DisputeInsight
+from app.api.services.pagination import SortKey, after_cursor, order_by_keys
+
+VALID_STATUSES = [
+    "Open",
+    "Under Review",
+    "Info Requested",
+    "Resolved",
+    "Approved",
+    "Rejected",
+]
+
+
+# Relationships GET /disputes/ can embed via ?expand=
+DISPUTE_EXPANSIONS = {"customer": Dispute.customer}
+
+
+class DisputeSort(str, Enum):
+    """Orderings offered by GET /disputes/"""
+
+    priority = "priority"  # highest priority first, then newest
+    newest = "newest"
+    oldest = "oldest"
+    amount = "amount"  # largest amount first, then newest
+
+
+def _as_list(values: Union[Any, Sequence[Any], None]) -> List[Any]:
+    """
+    Normalise a filter given as one value, a list of values, or (from query
+    strings) comma-separated values
+    """
+    if values is None:
+        return []
+    if isinstance(values, (str, int)):
+        values = [values]
+    flattened = []
+    for value in values:
+        if isinstance(value, str):
+            flattened.extend(part.strip() for part in value.split(",") if part.strip())
+        elif value is not None:
+            flattened.append(value)
+    return flattened
+
+
+def dispute_sort_keys(
+    priority_sort: bool = True,
+    date_sort: str = "desc",
+    priority: Union[int, Sequence[int], None] = None,
+    sort: Optional[DisputeSort] = None,
+) -> List[SortKey]:
+    """
+    Sort keys for the disputes listing, always ending in created_at then id
+    as a unique tie-breaker for cursor pagination.
+
+    ``sort`` selects one of the DisputeSort orderings; without it the legacy
+    ``priority_sort``/``date_sort`` pair applies. Priority ordering uses the
+    priority_sort column so NULL counts as 0.
+    """
+    if sort == DisputeSort.amount:
+        return [
+            (Dispute.amount, True),
+            (Dispute.created_at, True),
+            (Dispute.id, True),
+        ]
+    if sort is not None:
+        priority_sort = sort == DisputeSort.priority
+        date_sort = "asc" if sort == DisputeSort.oldest else "desc"
+
+    newest_first = date_sort.lower() != "asc"
+    keys = []
+    # Redundant when filtering to a single priority, and skipping it lets
+    # the (priority, created_at, id) index serve the order
+    if priority_sort and len(_as_list(priority)) != 1:
+        keys.append((Dispute.priority_sort, True))
+    keys.append((Dispute.created_at, newest_first))
+    keys.append((Dispute.id, newest_first))
+    return keys
+
+
+def build_dispute_query(
+    db: Session,
+    status: Union[str, Sequence[str], None] = None,
+    priority: Union[int, Sequence[int], None] = None,
+    category: Union[str, Sequence[str], None] = None,
+    priority_sort: bool = True,
+    date_sort: str = "desc",
+    cursor: Optional[str] = None,
+    sort: Optional[DisputeSort] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    risk_factor: Union[str, Sequence[str], None] = None,
+) -> Query:
+    """
+    Filtered and sorted disputes query behind GET /disputes/, starting after
+    ``cursor`` when given (see dispute_sort_keys for the ordering).
+
+    ``status``, ``priority`` and ``category`` each accept one value or a list
+    (matching any of them); amounts and creation dates are inclusive ranges.
+    ``risk_factor`` keeps disputes whose stored insight lists any of the
+    given risk factors (exact match).
+    The orderings match the composite indexes on disputes so they are served
+    without a sort step. Raises ValueError for an invalid filter or cursor.
+    """
+    query = db.query(Dispute)
+
+    # Apply filters
+    statuses = _as_list(status)
+    if statuses:
+        invalid = [value for value in statuses if value not in VALID_STATUSES]
+        if invalid:
+            raise ValueError(
+                f"Invalid status filter. Must be one of: {', '.join(VALID_STATUSES)}"
+            )
+        query = query.filter(Dispute.status.in_(statuses))
+
+    try:
+        priorities = [int(value) for value in _as_list(priority)]
+    except ValueError:
+        raise ValueError("Priority filter must be between 1 and 5")
+    if priorities:
+        if not all(1 <= value <= 5 for value in priorities):
+            raise ValueError("Priority filter must be between 1 and 5")
+        query = query.filter(Dispute.priority.in_(priorities))
+
+    categories = _as_list(category)
+    if categories:
+        query = query.filter(Dispute.category.in_(categories))
+
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise ValueError("min_amount must not be greater than max_amount")
+    if min_amount is not None:
+        query = query.filter(Dispute.amount >= min_amount)
+    if max_amount is not None:
+        query = query.filter(Dispute.amount <= max_amount)
+
+    if created_from and created_to and created_from > created_to:
+        raise ValueError("created_from must not be after created_to")
+    if created_from:
+        query = query.filter(Dispute.created_at >= created_from)
+    if created_to:
+        query = query.filter(Dispute.created_at <= created_to)
+
+    # Not split on commas: risk factors are free text and may contain them
+    risk_factors = [risk_factor] if isinstance(risk_factor, str) else risk_factor
+    if risk_factors:
+        factor = func.json_each(DisputeInsight.risk_factors).table_valued("value")
+        query = query.filter(
+            exists()
+            .select_from(join(DisputeInsight, factor, true()))
+            .where(DisputeInsight.dispute_id == Dispute.id)
+            .where(factor.c.value.in_(list(risk_factors)))
+        )
+
+    keys = dispute_sort_keys(priority_sort, date_sort, priorities, sort)
+    if cursor:
+        query = after_cursor(query, keys, cursor)
+    return order_by_keys(query, keys)
+
+
+def expand_dispute_query(
+    query: Query, expand: Union[str, Sequence[str], None]
+) -> Tuple[Query, List[str]]:
+    """
+    Eager-load the requested relationships with one SELECT ... IN per
+    relationship, instead of a lazy load per dispute. Returns the query and
+    the expansion names; raises ValueError for an unknown expansion.
+    """
+    names = list(dict.fromkeys(_as_list(expand)))
+    unknown = [name for name in names if name not in DISPUTE_EXPANSIONS]
+    if unknown:
+        raise ValueError(
+            f"Invalid expand value. Must be one of: {', '.join(DISPUTE_EXPANSIONS)}"
+        )
+    for name in names:
+        query = query.options(selectinload(DISPUTE_EXPANSIONS[name]))
+    return query, names
@@ -0,0 +1,114 @@
+# app/api/services/dispute_stats.py
+"""
+Rebuild and consistency checks for the dispute_stats counters.
+
+The counters are maintained incrementally on every flush (see
+maintain_dispute_stats); these helpers recompute them from the disputes
+table, either to repair drift or to verify the running totals.
+"""
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.api.database import Dispute, DisputeStat, stat_bucket
+
+# Float sums may differ from a fresh recompute by rounding error
+_TOLERANCE = 1e-6
+
+StatKey = Tuple[str, str]
+StatValues = Tuple[int, float, float]
+
+
+def load_dispute_stats(db: Session) -> Dict[StatKey, StatValues]:
+    return {
+        (row.dimension, row.bucket): (
+            row.count,
+            row.amount_sum,
+            row.resolution_hours_sum,
+        )
+        for row in db.query(DisputeStat).all()
+    }
+
+
+def compute_dispute_stats(db: Session) -> Dict[StatKey, StatValues]:
+    """Recompute every counter from the disputes table"""
+    stats: Dict[StatKey, StatValues] = {}
+    count, amount = db.query(func.count(Dispute.id), func.sum(Dispute.amount)).one()
+    if count:
+        stats[("total", "all")] = (count, amount or 0.0, 0.0)
+
+    for dimension in ("category", "status", "priority"):
+        column = getattr(Dispute, dimension)
+        rows = db.query(column, func.count(Dispute.id), func.sum(Dispute.amount))
+        for value, count, amount in rows.group_by(column):
+            stats[(dimension, stat_bucket(value))] = (count, amount or 0.0, 0.0)
+
+    resolved_day = func.date(Dispute.resolved_at)
+    hours = (
+        func.julianday(Dispute.resolved_at) - func.julianday(Dispute.created_at)
+    ) * 24
+    rows = (
+        db.query(
+            resolved_day,
+            func.count(Dispute.id),
+            func.sum(Dispute.amount),
+            func.sum(hours),
+        )
+        .filter(Dispute.resolved_at.isnot(None))
+        .group_by(resolved_day)
+    )
+    for day, count, amount, total_hours in rows:
+        stats[("resolved_day", day)] = (count, amount or 0.0, total_hours or 0.0)
+    return stats
+
+
+def rebuild_dispute_stats(db: Session) -> int:
+    """Replace the counters with a fresh recompute; returns the row count"""
+    stats = compute_dispute_stats(db)
+    db.query(DisputeStat).delete()
+    db.add_all(
+        DisputeStat(
+            dimension=dimension,
+            bucket=bucket,
+            count=count,
+            amount_sum=amount,
+            resolution_hours_sum=hours,
+        )
+        for (dimension, bucket), (count, amount, hours) in stats.items()
+    )
+    db.commit()
+    return len(stats)
+
+
+def check_dispute_stats(db: Session) -> List[Dict]:
+    """
+    Compare the stored counters with a fresh recompute. Returns one entry
+    per mismatched (dimension, bucket); an empty list means consistent.
+    """
+    stored = load_dispute_stats(db)
+    expected = compute_dispute_stats(db)
+    mismatches = []
+    for key in sorted(set(stored) | set(expected)):
+        have = stored.get(key, (0, 0.0, 0.0))
+        want = expected.get(key, (0, 0.0, 0.0))
+        if have[0] != want[0] or any(
+            abs(a - b) > _TOLERANCE * max(1.0, abs(b))
+            for a, b in zip(have[1:], want[1:])
+        ):
+            mismatches.append(
+                {
+                    "dimension": key[0],
+                    "bucket": key[1],
+                    "stored": list(have),
+                    "expected": list(want),
+                }
+            )
+    return mismatches
+
+
+def ensure_dispute_stats(db: Session) -> None:
+    """Backfill the counters for databases created before they existed"""
+    has_stats = db.query(DisputeStat.dimension).first() is not None
+    if not has_stats and db.query(Dispute.id).first() is not None:
+        rebuild_dispute_stats(db)
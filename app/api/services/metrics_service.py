@@ -0,0 +1,55 @@
+# app/api/services/metrics_service.py
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.api.services.dispute_stats import load_dispute_stats
+
+# Statuses counted as pending review on the dashboard
+PENDING_STATUSES = ["Open", "Under Review", "Info Requested"]
+
+# Priorities counted as high priority on the dashboard
+HIGH_PRIORITY_MIN = 4
+
+
+def read_dashboard_metrics(
+    db: Session, now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Dashboard metrics read from the dispute_stats counters"""
+    now = now or datetime.utcnow()
+    metrics = {
+        "total_disputes": 0,
+        "high_priority_count": 0,
+        "pending_count": 0,
+        "resolved_today": 0,
+        "disputes_by_category": {},
+        "disputes_by_status": {},
+        "disputes_by_priority": {},
+        "average_resolution_time": None,
+    }
+    resolved_count = 0
+    resolution_hours = 0.0
+    for (dimension, bucket), (count, _, hours) in load_dispute_stats(db).items():
+        if dimension == "total":
+            metrics["total_disputes"] = count
+        elif dimension == "category":
+            metrics["disputes_by_category"][bucket] = count
+        elif dimension == "status":
+            metrics["disputes_by_status"][bucket] = count
+            if bucket in PENDING_STATUSES:
+                metrics["pending_count"] += count
+        elif dimension == "priority" and bucket != "none":
+            metrics["disputes_by_priority"][bucket] = count
+            if int(bucket) >= HIGH_PRIORITY_MIN:
+                metrics["high_priority_count"] += count
+        elif dimension == "resolved_day":
+            if bucket == now.date().isoformat():
+                metrics["resolved_today"] = count
+            resolved_count += count
+            resolution_hours += hours
+
+    if resolved_count:
+        hours = resolution_hours / resolved_count
+        metrics["average_resolution_time"] = f"{hours:.1f}h"
+    return metrics
@@ -0,0 +1,96 @@
+# app/api/services/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+A listing is ordered by a list of sort keys ending in a unique column. The
+cursor for the next page encodes the last row's sort key values, and the
+next page starts strictly after them, so deep pages cost the same as the
+first and rows inserted mid-scroll don't shift later pages.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, DateTime, and_, literal, or_, tuple_
+from sqlalchemy.orm import Query
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (column, descending)
+SortKey = Tuple[Column, bool]
+
+
+def _signature(keys: Sequence[SortKey]) -> str:
+    return ",".join(
+        f"{column.key}:{'desc' if descending else 'asc'}" for column, descending in keys
+    )
+
+
+def order_by_keys(query: Query, keys: Sequence[SortKey]) -> Query:
+    return query.order_by(
+        *(column.desc() if descending else column.asc() for column, descending in keys)
+    )
+
+
+def encode_cursor(row: Any, keys: Sequence[SortKey]) -> str:
+    """Opaque cursor pointing just after ``row`` in the ``keys`` ordering"""
+    values = []
+    for column, _ in keys:
+        value = getattr(row, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    payload = json.dumps({"sort": _signature(keys), "after": values})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> List[Any]:
+    """
+    Return the sort key values stored in a cursor. Raises ValueError if the
+    cursor is malformed or was issued for a different sort order.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        signature, values = payload["sort"], payload["after"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValueError("Invalid pagination cursor")
+
+    if signature != _signature(keys) or len(values) != len(keys):
+        raise ValueError("Pagination cursor does not match the requested sort order")
+
+    decoded = []
+    for (column, _), value in zip(keys, values):
+        if isinstance(column.type, DateTime) and value is not None:
+            value = datetime.fromisoformat(value)
+        decoded.append(value)
+    return decoded
+
+
+def after_cursor(query: Query, keys: Sequence[SortKey], cursor: str) -> Query:
+    """Restrict an ordered query to the rows after ``cursor``"""
+    values = decode_cursor(cursor, keys)
+    bounds = [literal(value, column.type) for (column, _), value in zip(keys, values)]
+
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        # Uniform direction: a single row-value comparison the index can range-scan
+        columns = tuple_(*(column for column, _ in keys))
+        if directions.pop():
+            return query.filter(columns < tuple_(*bounds))
+        return query.filter(columns > tuple_(*bounds))
+
+    # Mixed directions: (a after x) OR (a = x AND b after y) OR ...
+    conditions = []
+    for position, ((column, descending), bound) in enumerate(zip(keys, bounds)):
+        equal_prefix = [keys[i][0] == bounds[i] for i in range(position)]
+        after = column < bound if descending else column > bound
+        conditions.append(and_(*equal_prefix, after))
+    return query.filter(or_(*conditions))
+
+
+def next_cursor(rows: List[Any], keys: Sequence[SortKey], limit: int) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None if this was the last page"""
+    if len(rows) < limit or not rows:
+        return None
+    return encode_cursor(rows[-1], keys)
@@ -26,7 +26,8 @@ class PriorityService:
             "priority_reason": analysis["priority_reason"],
         }
     
-    def _risk_based_priority(self, risk_score: float) -> int:
+    @staticmethod
+    def _risk_based_priority(risk_score: float) -> int:
         """Convert risk score to priority level"""
         if risk_score >= 80:
             return 5
@@ -0,0 +1,159 @@
+# app/api/services/snapshot_export.py
+"""
+Columnar snapshots of the disputes, customers and dispute_insights tables
+as Parquet or Arrow IPC (Feather v2) files, for loading into pandas or
+DuckDB.
+
+Rows are read in batches of SNAPSHOT_ROW_GROUP_SIZE and each batch is
+written as one row group / record batch, so memory stays bounded by the
+batch size. The JSON insight list columns become list<string> columns.
+"""
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import JSON, Boolean, DateTime, Float, Integer, Table, select
+from sqlalchemy.orm import Session
+
+from app.api.database import Customer, Dispute, DisputeInsight
+from app.core.config import settings
+
+SNAPSHOT_TABLES: Dict[str, Table] = {
+    "disputes": Dispute.__table__,
+    "customers": Customer.__table__,
+    "dispute_insights": DisputeInsight.__table__,
+}
+
+
+class SnapshotFormat(str, Enum):
+    parquet = "parquet"
+    arrow = "arrow"
+
+
+SNAPSHOT_MEDIA_TYPES = {
+    SnapshotFormat.parquet: "application/vnd.apache.parquet",
+    SnapshotFormat.arrow: "application/vnd.apache.arrow.file",
+}
+
+
+def _arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, JSON):
+        # The only JSON columns hold lists of strings
+        return pa.list_(pa.string())
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _exported_columns(table: Table) -> List:
+    # Generated columns are derived data; analysts can recompute them
+    return [column for column in table.columns if column.computed is None]
+
+
+def snapshot_schema(table_name: str) -> pa.Schema:
+    table = SNAPSHOT_TABLES[table_name]
+    return pa.schema(
+        pa.field(column.name, _arrow_type(column))
+        for column in _exported_columns(table)
+    )
+
+
+def iter_record_batches(
+    db: Session, table_name: str, batch_rows: Optional[int] = None
+) -> Iterator[pa.RecordBatch]:
+    """Read ``table_name`` in batches of rows, converted to record batches"""
+    table = SNAPSHOT_TABLES[table_name]
+    schema = snapshot_schema(table_name)
+    columns = _exported_columns(table)
+    batch_rows = batch_rows or settings.SNAPSHOT_ROW_GROUP_SIZE
+
+    result = db.execute(select(*columns).execution_options(yield_per=batch_rows))
+    for rows in result.partitions():
+        arrays = []
+        for position, field in enumerate(schema):
+            values = [row[position] for row in rows]
+            arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _open_writer(sink: Any, schema: pa.Schema, snapshot_format: SnapshotFormat):
+    if snapshot_format == SnapshotFormat.parquet:
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    return pa.ipc.new_file(sink, schema)
+
+
+def write_snapshot(
+    db: Session,
+    table_name: str,
+    sink: Any,
+    snapshot_format: SnapshotFormat = SnapshotFormat.parquet,
+    batch_rows: Optional[int] = None,
+) -> int:
+    """
+    Write a snapshot of ``table_name`` to ``sink`` (a path or a writable
+    file object, written sequentially). Returns the number of rows.
+    """
+    writer = _open_writer(sink, snapshot_schema(table_name), snapshot_format)
+    rows = 0
+    try:
+        for batch in iter_record_batches(db, table_name, batch_rows):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows
+
+
+class _ChunkSink:
+    """Write-only file object whose written bytes are drained by a generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def stream_snapshot(
+    db: Session,
+    table_name: str,
+    snapshot_format: SnapshotFormat = SnapshotFormat.parquet,
+    batch_rows: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Snapshot file bytes, sent as each row group / record batch is written"""
+    sink = _ChunkSink()
+    writer = _open_writer(sink, snapshot_schema(table_name), snapshot_format)
+    try:
+        for batch in iter_record_batches(db, table_name, batch_rows):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,151 @@
+# app/cli.py
+"""
+Command line entry points for maintenance tasks.
+
+Usage:
+    python -m app.cli analyze-batch [--limit N] [--batch-size N] [--concurrency N]
+    python -m app.cli bench-db [--readers N] [--writers N] [--seconds S] [--rows N]
+    python -m app.cli rebuild-stats
+    python -m app.cli check-stats
+    python -m app.cli dedupe-insights
+    python -m app.cli snapshot [--format parquet|arrow] [--output-dir DIR]
+                               [--tables T ...] [--batch-rows N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from app.api.database import (
+    SessionLocal,
+    create_missing_indexes,
+    deduplicate_insights,
+    engine,
+)
+from app.ai.client_pool import ai_service_pool
+from app.api.db_benchmark import compare_profiles
+from app.api.services.batch_analysis import run_batch_analysis
+from app.api.services.dispute_stats import check_dispute_stats, rebuild_dispute_stats
+from app.api.services.snapshot_export import (
+    SNAPSHOT_TABLES,
+    SnapshotFormat,
+    write_snapshot,
+)
+
+
+async def _analyze_batch(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        async for event in run_batch_analysis(
+            db,
+            ai_service_pool.acquire(),
+            limit=args.limit,
+            batch_size=args.batch_size,
+            max_concurrency=args.concurrency,
+        ):
+            print(json.dumps(event), flush=True)
+    finally:
+        db.close()
+        await ai_service_pool.shutdown()
+
+
+def _snapshot(args: argparse.Namespace) -> None:
+    snapshot_format = SnapshotFormat(args.format)
+    os.makedirs(args.output_dir, exist_ok=True)
+    db = SessionLocal()
+    try:
+        # One read transaction, so every table comes from the same snapshot
+        for table_name in args.tables or SNAPSHOT_TABLES:
+            path = os.path.join(
+                args.output_dir, f"{table_name}.{snapshot_format.value}"
+            )
+            rows = write_snapshot(
+                db, table_name, path, snapshot_format, args.batch_rows
+            )
+            print(json.dumps({"table": table_name, "rows": rows, "path": path}))
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dispute resolution maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = subparsers.add_parser(
+        "analyze-batch", help="Run AI analysis for all unanalyzed disputes"
+    )
+    batch_parser.add_argument("--limit", type=int, default=None)
+    batch_parser.add_argument("--batch-size", type=int, default=None)
+    batch_parser.add_argument("--concurrency", type=int, default=None)
+
+    bench_parser = subparsers.add_parser(
+        "bench-db",
+        help="Compare SQLite read/write concurrency with default and tuned pragmas",
+    )
+    bench_parser.add_argument("--readers", type=int, default=8)
+    bench_parser.add_argument("--writers", type=int, default=2)
+    bench_parser.add_argument("--seconds", type=float, default=5.0)
+    bench_parser.add_argument("--rows", type=int, default=2000)
+
+    subparsers.add_parser(
+        "rebuild-stats", help="Recompute the dispute_stats counters from scratch"
+    )
+    subparsers.add_parser(
+        "check-stats",
+        help="Compare the dispute_stats counters with the disputes table",
+    )
+
+    subparsers.add_parser(
+        "dedupe-insights",
+        help="Delete all but the newest insight per dispute and add the unique index",
+    )
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot", help="Write columnar Parquet/Arrow snapshots of the tables"
+    )
+    snapshot_parser.add_argument(
+        "--format",
+        choices=[f.value for f in SnapshotFormat],
+        default=SnapshotFormat.parquet.value,
+    )
+    snapshot_parser.add_argument("--output-dir", default=".")
+    snapshot_parser.add_argument(
+        "--tables", nargs="+", choices=list(SNAPSHOT_TABLES), default=None
+    )
+    snapshot_parser.add_argument("--batch-rows", type=int, default=None)
+
+    args = parser.parse_args()
+    if args.command == "analyze-batch":
+        asyncio.run(_analyze_batch(args))
+    elif args.command == "bench-db":
+        for result in compare_profiles(
+            readers=args.readers,
+            writers=args.writers,
+            seconds=args.seconds,
+            rows=args.rows,
+        ):
+            print(json.dumps(result), flush=True)
+    elif args.command in ("rebuild-stats", "check-stats"):
+        db = SessionLocal()
+        try:
+            if args.command == "rebuild-stats":
+                print(json.dumps({"rows": rebuild_dispute_stats(db)}), flush=True)
+            else:
+                mismatches = check_dispute_stats(db)
+                for mismatch in mismatches:
+                    print(json.dumps(mismatch), flush=True)
+                if mismatches:
+                    sys.exit(1)
+        finally:
+            db.close()
+    elif args.command == "dedupe-insights":
+        deleted = deduplicate_insights(engine)
+        create_missing_indexes(engine)
+        print(json.dumps({"deleted": deleted}), flush=True)
+    elif args.command == "snapshot":
+        _snapshot(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,46 @@ class AISettings(BaseSettings):
     GOOGLE_API_KEY: str  # No default value
 
     # Rest of your existing AI config
+    # Set GEMINI_MODEL=fake to use the deterministic offline backend
     GEMINI_MODEL: str = "gemini-2.0-flash"
     TEMPERATURE: float = 0.2
     MAX_TOKENS: int = 1024
     MAX_RETRIES: int = 2
     RETRY_DELAY: int = 4
 
+    # Number of pooled DisputeAIService instances shared by the API
+    AI_POOL_SIZE: int = 4
+
+    # "split" = separate priority and insights calls, "combined" = one call
+    ANALYSIS_MODE: str = "split"
+
+    # Content-addressed cache of LLM responses (SQLite file, TTL + LRU)
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_PATH: str = "./llm_cache.db"
+    AI_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    AI_CACHE_MAX_ENTRIES: int = 10000
+
+    # Client-side rate limiting shared by all LLM calls. Concurrency adapts
+    # between AI_MIN_CONCURRENCY and AI_MAX_CONCURRENCY (AIMD on 429s)
+    AI_RATE_LIMIT_ENABLED: bool = True
+    AI_REQUESTS_PER_MINUTE: int = 60
+    AI_TOKENS_PER_MINUTE: int = 250000
+    AI_MAX_CONCURRENCY: int = 8
+    AI_MIN_CONCURRENCY: int = 1
+
+    # Per-call timeout and circuit breaker; while the circuit is open,
+    # analysis falls back to rule-based scoring and stores a provisional insight
+    AI_TIMEOUT_SECONDS: float = 30.0
+    AI_BREAKER_ENABLED: bool = True
+    AI_BREAKER_FAILURE_THRESHOLD: int = 5
+    AI_BREAKER_RECOVERY_SECONDS: float = 30.0
+
+    # Synthetic behaviour of the fake backend (GEMINI_MODEL=fake)
+    AI_FAKE_LATENCY_MS: float = 800.0
+    AI_FAKE_JITTER_MS: float = 200.0
+    AI_FAKE_ERROR_RATE: float = 0.0
+    AI_FAKE_SEED: int = 0
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -9,6 +9,45 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     DATABASE_URL: str = "sqlite:///./disputes.db"
 
+    # SQLite pragmas applied to every new connection. WAL lets readers run
+    # alongside a writer; busy_timeout makes writers wait instead of failing
+    # with "database is locked". Leave a value empty to keep SQLite's default.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_CACHE_SIZE: int = -65536  # negative means KiB: 64 MiB per connection
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
+    # Engine connection pool (QueuePool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+
+    # Worker threads for blocking database work (sync routes and DB calls
+    # made from async handlers); requests beyond this queue for a thread.
+    # Matches DB_POOL_SIZE + DB_MAX_OVERFLOW so threads don't wait on the pool
+    DB_THREADPOOL_SIZE: int = 15
+
+    # Background analysis queue: number of worker tasks, and whether
+    # POST /disputes/{id}/analyze queues a job (202) unless told otherwise
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_BACKGROUND_DEFAULT: bool = False
+
+    # Bulk analysis: disputes per LLM batch and concurrent requests per batch
+    BATCH_ANALYSIS_SIZE: int = 20
+    BATCH_ANALYSIS_CONCURRENCY: int = 5
+
+    # Bulk ingestion: rows validated and inserted per transaction
+    BULK_CHUNK_SIZE: int = 1000
+
+    # Export: rows fetched from the database per batch while streaming
+    EXPORT_YIELD_PER: int = 1000
+    # Snapshot export: rows per Parquet row group / Arrow record batch
+    SNAPSHOT_ROW_GROUP_SIZE: int = 65536
+
     # Add this to accept Google API key from environment
     GOOGLE_API_KEY: str = None
 
@@ -12,6 +12,9 @@ def dispute_card(dispute: Dict):
         5: "#d9534f",
     }
 
+    # Present when the listing was fetched with expand=["customer"]
+    customer = dispute.get("customer") or {}
+
     with st.container():
         st.markdown(
             f"""
@@ -35,6 +38,7 @@ def dispute_card(dispute: Dict):
                     {dispute.get('priority', 'N/A')}
                 </div>
             </div>
+            <p style='margin: 4px 0; font-size: 0.9em;'>{customer.get('name', '')}</p>
             <p style='margin: 8px 0; color: #666;'>{dispute['description'][:100]}...</p>
             <div style='display: flex; justify-content: space-between; font-size: 0.9em;'>
                 <div>${dispute['amount']}</div>
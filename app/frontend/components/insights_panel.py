@@ -26,84 +26,22 @@ def ai_insights_panel(analysis: Dict[str, Any], priority: int):
                 st.markdown("### AI Insights")
                 st.markdown(analysis["insights"])
 
-        # Follow-up Questions
-        if analysis.get("followup_questions"):
-            with st.expander("Follow-up Questions", expanded=True):
-                if isinstance(analysis["followup_questions"], str):
-                    try:
-                        # Attempt to parse as a list (in case it's a string representation)
-                        questions = eval(analysis["followup_questions"])
-                        if isinstance(questions, list):
-                            for question in questions:
-                                st.markdown(f"- {question}")
-                        else:
-                            st.markdown(analysis["followup_questions"])  # Display as is
-                    except:
-                        st.markdown(
-                            analysis["followup_questions"]
-                        )  # Display as is if parsing fails
-                elif isinstance(analysis["followup_questions"], list):
-                    for question in analysis["followup_questions"]:
-                        st.markdown(f"- {question}")
-                else:
-                    st.markdown(analysis["followup_questions"])
-
-        # Probable Solutions
-        if analysis.get("probable_solutions"):
-            with st.expander("Probable Solutions", expanded=True):
-                if isinstance(analysis["probable_solutions"], str):
-                    try:
-                        solutions = eval(analysis["probable_solutions"])
-                        if isinstance(solutions, list):
-                            for solution in solutions:
-                                st.markdown(f"- {solution}")
-                        else:
-                            st.markdown(analysis["probable_solutions"])
-                    except:
-                        st.markdown(analysis["probable_solutions"])
-                elif isinstance(analysis["probable_solutions"], list):
-                    for solution in analysis[
-                        "probable_solutions"
-                    ]:  # Use analysis["probable_solutions"] instead of solutions
-                        st.markdown(f"- {solution}")
-                else:
-                    st.markdown(analysis["probable_solutions"])
-
-        # Possible Reasons
-        if analysis.get("possible_reasons"):
-            with st.expander("Possible Reasons", expanded=True):
-                if isinstance(analysis["possible_reasons"], str):
-                    try:
-                        reasons = eval(analysis["possible_reasons"])
-                        if isinstance(reasons, list):
-                            for reason in reasons:
-                                st.markdown(f"- {reason}")
-                        else:
-                            st.markdown(analysis["possible_reasons"])
-                    except:
-                        st.markdown(analysis["possible_reasons"])
-
-                elif isinstance(analysis["possible_reasons"], list):
-                    for reason in analysis["possible_reasons"]:
-                        st.markdown(f"- {reason}")
-                else:
-                    st.markdown(analysis["possible_reasons"])
-
-        # Risk Factors
-        if analysis.get("risk_factors"):
-            with st.expander("Risk Factors", expanded=True):
-                if isinstance(analysis["risk_factors"], str):
-                    try:
-                        risk_factors = eval(analysis["risk_factors"])
-                        if isinstance(risk_factors, list):
-                            for risk_factor in risk_factors:
-                                st.markdown(f"- {risk_factor}")
-                        else:
-                            st.markdown(analysis["risk_factors"])
-                    except:
-                        st.markdown(analysis["risk_factors"])
-                elif isinstance(analysis["risk_factors"], list):
-                    for risk_factor in analysis["risk_factors"]:
-                        st.markdown(f"- {risk_factor}")
-                else:
-                    st.markdown(analysis["risk_factors"])
+        # List fields arrive as JSON arrays from the API
+        for field, title in (
+            ("followup_questions", "Follow-up Questions"),
+            ("probable_solutions", "Probable Solutions"),
+            ("possible_reasons", "Possible Reasons"),
+            ("risk_factors", "Risk Factors"),
+        ):
+            if analysis.get(field):
+                with st.expander(title, expanded=True):
+                    _bullet_list(analysis[field])
+
+
+def _bullet_list(items: Any):
+    """Render a list as markdown bullets, anything else as is"""
+    if isinstance(items, list):
+        for item in items:
+            st.markdown(f"- {item}")
+    else:
+        st.markdown(items)
@@ -16,7 +16,10 @@ def display_admin():
         col1, col2 = st.columns(2)
         with col1:
             st.metric("Total Disputes", metrics.get("total_disputes", 0))
-            st.metric("Average Resolution Time", "24h")
+            st.metric(
+                "Average Resolution Time",
+                metrics.get("average_resolution_time") or "N/A",
+            )
         with col2:
             st.metric("API Health", "✅ Operational")
             st.metric("Active Users", 15)
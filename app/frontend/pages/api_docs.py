@@ -45,6 +45,10 @@ def display_api_docs():
         - `skip`: int (default: 0)
         - `limit`: int (default: 100)
         - `account_type`: string (optional)
+        - `cursor`: string (optional, replaces `skip`)
+        
+        Full pages include an `X-Next-Cursor` response header; pass it back as
+        `cursor` to fetch the next page.
         
         **Response:** (Status Code: 200)
         ```json
@@ -82,6 +86,7 @@ def display_api_docs():
         **Query Parameters:**
         - `skip`: int (default: 0)
         - `limit`: int (default: 100)
+        - `cursor`: string (optional, from `X-Next-Cursor`; replaces `skip`)
         
         **Response:** (Status Code: 200)
         ```json
@@ -136,6 +141,26 @@ def display_api_docs():
           "message": "Customer deleted successfully"
         }
         ```
+
+        ### 7. Bulk Create Customers
+        **POST** `/customers/bulk`
+
+        **Input:** a JSON array of Create Customer bodies, or one body per line
+        with `Content-Type: application/x-ndjson`.
+
+        **Response:** (Status Code: 200)
+        ```json
+        {
+          "total": 3,
+          "created": 2,
+          "failed": 1,
+          "results": [
+            {"index": 0, "status": "created", "id": "550e8400-e29b-41d4-a716-446655440000"},
+            {"index": 1, "status": "created", "id": "550e8400-e29b-41d4-a716-446655440001"},
+            {"index": 2, "status": "error", "error": "Email already registered"}
+          ]
+        }
+        ```
         """
         )
 
@@ -180,8 +205,23 @@ def display_api_docs():
         **Query Parameters:**
         - `skip`: int (default: 0)
         - `limit`: int (default: 100)
-        - `status`: string (optional)
-        - `priority_sort`: bool (default: true)
+        - `status`: string (optional, repeatable or comma-separated)
+        - `priority`: int 1-5 (optional, repeatable or comma-separated)
+        - `category`: string (optional, repeatable or comma-separated)
+        - `min_amount`, `max_amount`: float (optional, inclusive)
+        - `created_from`, `created_to`: ISO datetime (optional, inclusive)
+        - `risk_factor`: string (optional, repeatable; exact match against the
+          dispute's stored insight `risk_factors`)
+        - `sort`: `priority` | `newest` | `oldest` | `amount` (optional)
+        - `priority_sort`: bool (default: true; ignored when `sort` is set)
+        - `date_sort`: `asc` | `desc` (default: desc; ignored when `sort` is set)
+        - `cursor`: string (optional, from `X-Next-Cursor`; replaces `skip`)
+        - `expand`: `customer` (optional; embeds each dispute's `customer` object)
+        
+        Example: `/disputes/?status=Open&status=Under Review&priority=4,5&sort=amount`
+        
+        Cursor paging stays stable when new disputes arrive mid-scroll. A cursor
+        only works with the filters and sort order it was issued for.
         
         **Response:** (Status Code: 200)
         ```json
@@ -289,6 +329,97 @@ def display_api_docs():
           }
         }
         ```
+        
+        **Background mode:** `POST /disputes/{dispute_id}/analyze?background=true`
+        
+        **Response:** (Status Code: 202)
+        ```json
+        {
+          "id": "8d0c2f5e-4b7a-4f0e-9a57-2f1f5c7e9b11",
+          "dispute_id": "550e8400-e29b-41d4-a716-446655440010",
+          "status": "queued",
+          "result": null,
+          "error": null,
+          "attempts": 0,
+          "created_at": "2025-03-22T15:30:45.123456",
+          "started_at": null,
+          "completed_at": null
+        }
+        ```
+        
+        ### 7. Get Analysis Job
+        **GET** `/analysis-jobs/{job_id}`
+        
+        Returns the job in the same shape; `status` moves from `queued` to `running`
+        to `completed` (with `result` holding the analysis) or `failed` (with `error`).
+
+        ### 8. Stream Dispute Analysis
+        **GET** `/disputes/{dispute_id}/analyze/stream`
+
+        **Response:** (Status Code: 200, `text/event-stream`)
+        ```
+        event: risk
+        data: {"priority": 3, "risk_score": 4.5, "risk_factors": ["High transaction amount"], "provisional": true}
+
+        event: priority
+        data: {"priority": 4, "priority_reason": "High value transaction with a new merchant", "priority_ms": 812.4}
+
+        event: insights_token
+        data: {"text": "{\"insights\": \"This appears"}
+
+        event: analysis
+        data: {"priority": 4, "insights": "This appears to be a legitimate dispute...", ...}
+        ```
+
+        The final `analysis` event is sent once the insight has been stored; failures
+        are sent as an `error` event.
+
+        ### 9. Get Full Dispute
+        **GET** `/disputes/{dispute_id}/full`
+
+        Returns the dispute with its `customer` (as in Get Dispute by ID), its
+        stored `insights` (as in Get Dispute Insights, or null) and its `notes`,
+        loaded together in one request.
+
+        **Response:** (Status Code: 200)
+        ```json
+        {
+          "id": "550e8400-e29b-41d4-a716-446655440010",
+          "status": "Open",
+          "priority": 4,
+          "customer": {"id": "550e8400-e29b-41d4-a716-446655440000", "name": "John Doe", ...},
+          "insights": {"insights": "Detailed analysis...", "risk_score": 6.5, ...},
+          "notes": [
+            {
+              "id": "550e8400-e29b-41d4-a716-446655440030",
+              "dispute_id": "550e8400-e29b-41d4-a716-446655440010",
+              "content": "Customer called to confirm",
+              "created_at": "2025-03-22T16:00:00.000000"
+            }
+          ],
+          ...
+        }
+        ```
+
+        ### 10. Bulk Create Disputes
+        **POST** `/disputes/bulk`
+
+        **Input:** a JSON array of Create Dispute bodies, or one body per line
+        with `Content-Type: application/x-ndjson`.
+
+        **Response:** (Status Code: 200) the same per-row report as Bulk Create
+        Customers. Rows are inserted in transactions of `BULK_CHUNK_SIZE` rows;
+        unknown customers and invalid rows are reported without failing the rest.
+
+        ### 11. Export Disputes
+        **GET** `/disputes/export`
+
+        **Query Parameters:** the Get All Disputes filters and sort options, plus
+        - `format`: `ndjson` | `csv` (default: ndjson)
+        - `include_insights`: bool (default: false; adds `insight_*` columns)
+
+        Streams every matching dispute (no `limit`) as `application/x-ndjson` or
+        `text/csv`, with constant server memory regardless of table size.
         """
         )
 
@@ -388,6 +519,51 @@ def display_api_docs():
         """
         )
 
+    with st.expander("📊 Metrics Endpoints", expanded=True):
+        st.markdown(
+            """
+        ### 1. Get Dashboard Metrics
+        **GET** `/metrics/dashboard`
+
+        **Response:** (Status Code: 200)
+        ```json
+        {
+          "total_disputes": 42,
+          "high_priority_count": 7,
+          "pending_count": 18,
+          "resolved_today": 3,
+          "disputes_by_category": {"Fraud": 12, "Duplicate": 30},
+          "disputes_by_status": {"Open": 15, "Under Review": 3, "Resolved": 24},
+          "disputes_by_priority": {"5": 4, "4": 3, "2": 10},
+          "average_resolution_time": "26.5h"
+        }
+        ```
+
+        Figures are read from the `dispute_stats` counter table, which is kept in
+        step with every dispute write.
+        `average_resolution_time` is null until a dispute has been resolved.
+        """
+        )
+
+    with st.expander("🗄️ Snapshot Endpoints", expanded=True):
+        st.markdown(
+            """
+        ### 1. Get Table Snapshot
+        **GET** `/snapshots/{table_name}`
+
+        `table_name` is `disputes`, `customers` or `dispute_insights`.
+
+        **Query Parameters:**
+        - `format`: `parquet` | `arrow` (default: parquet; `arrow` is an Arrow IPC file)
+
+        Streams a columnar file written one row group at a time. The insight list
+        fields are `list<string>` columns. Load it with
+        `pandas.read_parquet` / `pandas.read_feather` or DuckDB's `read_parquet`.
+        The same snapshots can be written to disk with
+        `python -m app.cli snapshot --format parquet --output-dir DIR`.
+        """
+        )
+
     st.markdown(
         """
     ## Note
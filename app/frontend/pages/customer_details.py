@@ -12,12 +12,12 @@ def display_customer_details():
 
     # Get customer ID from query params
     customer_id = st.query_params.get("id")
-    if customer := DisputeAPIClient.get_customer(customer_id):
-        st.title(f"Customer Profile: {customer.get('name', 'Unknown')}")
 
     # Load customer data
     customer = DisputeAPIClient.get_customer(customer_id)
-    if not customer:
+    if customer:
+        st.title(f"Customer Profile: {customer.get('name', 'Unknown')}")
+    else:
         st.error("Customer not found")
         st.button(
             "Return to Dashboard",
@@ -156,9 +156,7 @@ def display_customer_details():
                 target_customer = st.selectbox(
                     "Select target customer",
                     options=[
-                        c["id"]
-                        for c in DisputeAPIClient.get_customers()
-                        if c["id"] != customer_id
+                        c["id"] for c in all_customers or [] if c["id"] != customer_id
                     ],
                 )
                 confirm_merge = st.checkbox("Confirm account merge")
@@ -394,7 +392,7 @@ def display_customer_details_page():
                             "Select target customer",
                             options=[
                                 c["id"]
-                                for c in DisputeAPIClient.get_customers()
+                                for c in all_customers or []
                                 if c["id"] != st.session_state.selected_customer_id
                             ],
                         )
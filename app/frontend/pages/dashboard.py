@@ -105,51 +105,23 @@ def display_dashboard():
             use_container_width=True,
         )
 
-    # Load disputes with filters
+    # Load disputes with filters applied and sorted by the API
     sort_mapping = {
         "Priority": "priority",
-        "Date (Newest)": "date_desc",
-        "Date (Oldest)": "date_asc",
-        "Amount (High to Low)": "amount_desc",
+        "Date (Newest)": "newest",
+        "Date (Oldest)": "oldest",
+        "Amount (High to Low)": "amount",
     }
-
-    # Get all disputes
-    all_disputes = DisputeAPIClient.get_disputes(
-        sort_by=sort_mapping.get(sort_option, "priority")
+    disputes = (
+        DisputeAPIClient.get_disputes(
+            sort_by=sort_mapping.get(sort_option, "priority"),
+            statuses=status_filter,
+            priorities=priority_filter,
+            expand=["customer"],
+        )
+        or []
     )
 
-    # Apply filters manually (since API filter parameters aren't working)
-    if all_disputes:
-        filtered_disputes = all_disputes
-
-        # Apply priority filter if set
-        if priority_filter:
-            filtered_disputes = [
-                d for d in filtered_disputes if d.get("priority") in priority_filter
-            ]
-
-        # Apply status filter if set
-        if status_filter:
-            filtered_disputes = [
-                d for d in filtered_disputes if d.get("status") in status_filter
-            ]
-
-        # Apply sorting if needed
-        if sort_option == "Date (Newest)":
-            filtered_disputes.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        elif sort_option == "Date (Oldest)":
-            filtered_disputes.sort(key=lambda x: x.get("created_at", ""))
-        elif sort_option == "Amount (High to Low)":
-            filtered_disputes.sort(
-                key=lambda x: float(x.get("amount", 0)), reverse=True
-            )
-        elif sort_option == "Priority":
-            filtered_disputes.sort(key=lambda x: x.get("priority", 1), reverse=True)
-
-        disputes = filtered_disputes
-    else:
-        disputes = []
-
     # Display disputes
     if disputes:
         st.subheader(f"Disputes ({len(disputes)})")
@@ -9,13 +9,9 @@ from components.followup_questions import display_followup_questions
 def display_dispute_details():
     """Detailed view of a single dispute"""
 
-    # Get all disputes
-    all_disputes = DisputeAPIClient.get_disputes()
-
     # Get dispute ID from query params
     dispute_id = st.query_params.get("id")
 
-
     if not dispute_id:
         st.error("No dispute selected")
         st.button(
@@ -24,8 +20,8 @@ def display_dispute_details():
         )
         return
 
-    # Load dispute data
-    dispute = DisputeAPIClient.get_dispute(dispute_id)
+    # Load the dispute with its customer, insights and notes in one request
+    dispute = DisputeAPIClient.get_dispute_full(dispute_id)
     if not dispute:
         st.error("Dispute not found")
         st.button(
@@ -128,8 +124,8 @@ def display_dispute_details():
         # AI Insights Section
         st.markdown("## AI Analysis")
 
-        # Get analysis from dedicated insights endpoint
-        analysis = DisputeAPIClient.get_insights(dispute_id)
+        # Stored analysis, loaded with the dispute
+        analysis = dispute.get("insights")
 
         if analysis:
             ai_insights_panel(analysis, dispute.get("priority", 3))
@@ -234,8 +230,8 @@ def display_dispute_details():
 def display_dispute_details_page():
     """Detailed view of a single dispute"""
 
-    # Get all disputes
-    all_disputes = DisputeAPIClient.get_disputes()
+    # Get all disputes, with customers embedded for the list's name column
+    all_disputes = DisputeAPIClient.get_disputes(expand=["customer"]) or []
 
     # Initialize session state to store selected dispute if not already set
     if "selected_dispute_id" not in st.session_state:
@@ -534,9 +530,9 @@ def display_dispute_details_page():
 
 # Helper function to safely get customer name from dispute object
 def get_customer_name(dispute):
-    customer_id = dispute.get("customer_id")
-    if isinstance(customer_id, dict):
-        return customer_id.get("name", "Unknown")
+    customer = dispute.get("customer")
+    if isinstance(customer, dict):
+        return customer.get("name", "Unknown")
     return "Unknown"
 
 
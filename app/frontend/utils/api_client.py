@@ -1,15 +1,91 @@
 # app/frontend/utils/api_client.py
+import logging
+import os
+import threading
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional, Any, Union
+from urllib3.util.retry import Retry
 import time
 from datetime import datetime, timedelta
 import random
 import uuid
 
+logger = logging.getLogger(__name__)
+
+# Connection settings, overridable from the environment
+API_URL = os.getenv("API_URL", "http://localhost:8000").rstrip("/")
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+# AI analysis waits on the LLM, so it gets a longer read timeout
+ANALYZE_TIMEOUT = float(os.getenv("API_ANALYZE_TIMEOUT", "120"))
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.3"))
+# Seconds a cached read is reused before it is fetched again
+DISPUTES_CACHE_TTL = float(os.getenv("API_DISPUTES_CACHE_TTL", "30"))
+CUSTOMERS_CACHE_TTL = float(os.getenv("API_CUSTOMERS_CACHE_TTL", "60"))
+INSIGHTS_CACHE_TTL = float(os.getenv("API_INSIGHTS_CACHE_TTL", "60"))
+METRICS_CACHE_TTL = float(os.getenv("API_METRICS_CACHE_TTL", "15"))
+HEALTH_CACHE_TTL = float(os.getenv("API_HEALTH_CACHE_TTL", "10"))
+
+
+def create_session() -> requests.Session:
+    """
+    Keep-alive session with a pooled adapter. Failed connections and 502,
+    503 and 504 responses are retried with backoff, for idempotent methods
+    only (urllib3's default, which excludes POST).
+    """
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class DisputeAPIClient:
-    BASE_URL = "http://localhost:8000/api/v1"
+    BASE_URL = f"{API_URL}/api/v1"
+    TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Shared session, so Streamlit reruns reuse pooled connections"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    cls._session = create_session()
+        return cls._session
+
+    @classmethod
+    def _request(cls, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request on the shared session, logging its latency"""
+        kwargs.setdefault("timeout", cls.TIMEOUT)
+        started = time.perf_counter()
+        try:
+            response = cls.session().request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.warning(
+                "%s %s failed after %.1f ms: %s", method, url, elapsed_ms, e
+            )
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            "%s %s -> %s in %.1f ms", method, url, response.status_code, elapsed_ms
+        )
+        return response
 
     @classmethod
     def _handle_response(cls, response):
@@ -27,112 +103,208 @@ class DisputeAPIClient:
             return None
 
     @classmethod
-    def get_disputes(cls, sort_by="priority") -> List[Dict]:
-        params = {"priority_sort": True}  # Add other params as needed
-        response = requests.get(f"{cls.BASE_URL}/disputes/", params=params)
-        return cls._handle_response(response)
+    def _cached_get(cls, fetch, url: str, params: Optional[Dict] = None):
+        """
+        Read through one of the st.cache_data caches below. Errors are shown
+        and return None without being cached, so the next rerun retries.
+        """
+        try:
+            return fetch(url, params)
+        except requests.exceptions.RequestException as e:
+            st.error(f"API Error: {e}")
+            return None
+        except ValueError:
+            st.error(f"Invalid JSON response from API for {url}")
+            return None
+
+    @staticmethod
+    def _invalidate(*caches) -> None:
+        """Drop cached reads a mutation may have made stale"""
+        for cache in caches:
+            cache.clear()
+
+    @classmethod
+    def get_disputes(
+        cls,
+        sort_by: str = "priority",
+        statuses: Optional[List[str]] = None,
+        priorities: Optional[List[int]] = None,
+        categories: Optional[List[str]] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        limit: int = 100,
+        expand: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        Fetch disputes filtered and sorted by the API. expand=["customer"]
+        embeds each dispute's customer, avoiding a lookup per dispute.
+        """
+        params = {
+            "sort": sort_by,
+            "status": statuses or [],
+            "priority": priorities or [],
+            "category": categories or [],
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "limit": limit,
+            "expand": expand or [],
+        }
+        return cls._cached_get(_fetch_disputes, f"{cls.BASE_URL}/disputes/", params)
 
     @classmethod
     def get_dispute(cls, dispute_id: str) -> Optional[Dict]:
-        response = requests.get(f"{cls.BASE_URL}/disputes/{dispute_id}")
-        return cls._handle_response(response)
+        return cls._cached_get(
+            _fetch_disputes, f"{cls.BASE_URL}/disputes/{dispute_id}"
+        )
+
+    @classmethod
+    def get_dispute_full(cls, dispute_id: str) -> Optional[Dict]:
+        """Dispute with its customer, insights and notes in one request"""
+        return cls._cached_get(
+            _fetch_disputes, f"{cls.BASE_URL}/disputes/{dispute_id}/full"
+        )
 
     @classmethod
     def analyze_dispute(cls, dispute_id: str) -> Optional[Dict]:
-        response = requests.post(f"{cls.BASE_URL}/disputes/{dispute_id}/analyze")
+        response = cls._request(
+            "POST",
+            f"{cls.BASE_URL}/disputes/{dispute_id}/analyze",
+            timeout=(CONNECT_TIMEOUT, ANALYZE_TIMEOUT),
+        )
+        # Analysis stores an insight and sets the dispute's priority
+        cls._invalidate(_fetch_disputes, _fetch_insights, _fetch_metrics)
         return cls._handle_response(response)
 
     @classmethod
     def create_dispute(cls, dispute_data: Dict) -> Optional[Dict]:
-        response = requests.post(f"{cls.BASE_URL}/disputes/", json=dispute_data)
+        response = cls._request(
+            "POST", f"{cls.BASE_URL}/disputes/", json=dispute_data
+        )
+        # Also bumps the customer's dispute_count
+        cls._invalidate(_fetch_disputes, _fetch_customers, _fetch_metrics)
         return cls._handle_response(response)
 
     @classmethod
     def update_dispute(cls, dispute_id: str, update_data: Dict) -> bool:
-        response = requests.put(
-            f"{cls.BASE_URL}/disputes/{dispute_id}", json=update_data
+        response = cls._request(
+            "PUT", f"{cls.BASE_URL}/disputes/{dispute_id}", json=update_data
         )
+        cls._invalidate(_fetch_disputes, _fetch_metrics)
         return response.status_code == 200
 
     @classmethod
     def get_customers(cls) -> List[Dict]:
-        response = requests.get(f"{cls.BASE_URL}/customers/")
-        return cls._handle_response(response)
+        return cls._cached_get(_fetch_customers, f"{cls.BASE_URL}/customers/")
 
     @classmethod
     def get_customer(cls, customer_id: str) -> Optional[Dict]:
-        response = requests.get(f"{cls.BASE_URL}/customers/{customer_id}")
-        return cls._handle_response(response)
+        return cls._cached_get(
+            _fetch_customers, f"{cls.BASE_URL}/customers/{customer_id}"
+        )
 
     @classmethod
     def create_customer(cls, customer_data: Dict) -> Optional[Dict]:
-        response = requests.post(f"{cls.BASE_URL}/customers/", json=customer_data)
+        response = cls._request(
+            "POST", f"{cls.BASE_URL}/customers/", json=customer_data
+        )
+        cls._invalidate(_fetch_customers)
         return cls._handle_response(response)
 
     @classmethod
     def get_dashboard_metrics(cls) -> Dict:
-        """Calculate metrics locally using existing endpoints"""
-        try:
-            disputes = cls.get_disputes() or []
-            customers = cls.get_customers() or []
-
-            high_priority = len([d for d in disputes if d.get("priority", 0) >= 4])
-            pending_statuses = ["Open", "Under Review", "Info Requested"]
-            pending = len([d for d in disputes if d.get("status") in pending_statuses])
-
-            return {
-                "total_disputes": len(disputes),
-                "high_priority_count": high_priority,
-                "pending_count": pending,
-                "total_customers": len(customers),
-                "avg_resolution_time": "24h",  # Mocked value
-            }
-        except Exception as e:
-            st.error(f"Metrics calculation failed: {e}")
-            return {
-                "total_disputes": 0,
-                "high_priority_count": 0,
-                "pending_count": 0,
-                "total_customers": 0,
-                "avg_resolution_time": "N/A",
-            }
+        """Fetch dashboard metrics aggregated by the API"""
+        metrics = cls._cached_get(
+            _fetch_metrics, f"{cls.BASE_URL}/metrics/dashboard"
+        )
+        if metrics is not None:
+            return metrics
+        return {
+            "total_disputes": 0,
+            "high_priority_count": 0,
+            "pending_count": 0,
+            "resolved_today": 0,
+            "average_resolution_time": None,
+        }
 
     @classmethod
     def check_health(cls) -> bool:
         """Simple health check that verifies API connectivity"""
-        try:
-            response = requests.get(f"http://localhost:8000/health", timeout=2)
-            return response.status_code == 200
-        except requests.exceptions.RequestException:
-            return False
+        return _check_health(f"{API_URL}/health")
 
     @classmethod
     def get_customer_disputes(cls, customer_id: str) -> List[Dict]:
-        response = requests.get(f"{cls.BASE_URL}/customers/{customer_id}/disputes")
-        return cls._handle_response(response)
+        return cls._cached_get(
+            _fetch_disputes, f"{cls.BASE_URL}/customers/{customer_id}/disputes"
+        )
 
     @classmethod
     def get_insights(cls, dispute_id: str) -> Optional[Dict]:
-        response = requests.get(f"{cls.BASE_URL}/disputes/{dispute_id}/insights")
-        return cls._handle_response(response)
+        return cls._cached_get(
+            _fetch_insights, f"{cls.BASE_URL}/disputes/{dispute_id}/insights"
+        )
 
     @classmethod
     def save_insights(cls, dispute_id: str, insights: Dict) -> bool:
-        response = requests.post(
-            f"{cls.BASE_URL}/disputes/{dispute_id}/insights", json=insights
+        response = cls._request(
+            "POST", f"{cls.BASE_URL}/disputes/{dispute_id}/insights", json=insights
         )
+        # Saving insights also sets the dispute's priority
+        cls._invalidate(_fetch_insights, _fetch_disputes, _fetch_metrics)
         return response.status_code == 200
 
     # update customer
     @classmethod
     def update_customer(cls, customer_id: str, update_data: Dict) -> bool:
-        response = requests.put(
-            f"{cls.BASE_URL}/customers/{customer_id}", json=update_data
+        response = cls._request(
+            "PUT", f"{cls.BASE_URL}/customers/{customer_id}", json=update_data
         )
+        # Dispute details embed the customer
+        cls._invalidate(_fetch_customers, _fetch_disputes)
         return response.status_code == 200
     
     # Delete customer
     @classmethod
     def delete_customer(cls, customer_id: str) -> bool:
-        response = requests.delete(f"{cls.BASE_URL}/customers/{customer_id}")
-        return response.status_code == 204
\ No newline at end of file
+        response = cls._request(
+            "DELETE", f"{cls.BASE_URL}/customers/{customer_id}"
+        )
+        cls._invalidate(_fetch_customers, _fetch_disputes, _fetch_metrics)
+        return response.status_code == 204
+
+
+# Cached reads, shared by every Streamlit session and keyed by URL and query
+# parameters. Each resource group has its own cache so a mutation only drops
+# the groups it can affect; the TTLs bound staleness from other writers.
+def _get_json(url: str, params: Optional[Dict] = None) -> Any:
+    response = DisputeAPIClient._request("GET", url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=DISPUTES_CACHE_TTL, show_spinner=False)
+def _fetch_disputes(url: str, params: Optional[Dict] = None) -> Any:
+    return _get_json(url, params)
+
+
+@st.cache_data(ttl=CUSTOMERS_CACHE_TTL, show_spinner=False)
+def _fetch_customers(url: str, params: Optional[Dict] = None) -> Any:
+    return _get_json(url, params)
+
+
+@st.cache_data(ttl=INSIGHTS_CACHE_TTL, show_spinner=False)
+def _fetch_insights(url: str, params: Optional[Dict] = None) -> Any:
+    return _get_json(url, params)
+
+
+@st.cache_data(ttl=METRICS_CACHE_TTL, show_spinner=False)
+def _fetch_metrics(url: str, params: Optional[Dict] = None) -> Any:
+    return _get_json(url, params)
+
+
+@st.cache_data(ttl=HEALTH_CACHE_TTL, show_spinner=False)
+def _check_health(url: str) -> bool:
+    try:
+        response = DisputeAPIClient._request("GET", url, timeout=2)
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
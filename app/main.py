@@ -1,8 +1,13 @@
 # app/main.py
 from fastapi import FastAPI
 from app.core.config import settings
-from app.api.routes import disputes, customers
-from app.api.database import Base, engine
+from app.api.routes import disputes, customers, analysis_jobs, metrics, snapshots
+from app.api.database import Base, SessionLocal, engine
+from app.api.services.pagination import NEXT_CURSOR_HEADER
+from app.api.db_threads import configure_db_threadpool, db_threadpool_stats
+from app.ai.client_pool import ai_service_pool
+from app.api.services.analysis_queue import analysis_queue
+from app.api.services.dispute_stats import ensure_dispute_stats
 from fastapi.middleware.cors import CORSMiddleware
 
 
@@ -18,17 +23,37 @@ app.add_middleware(
     allow_origins=["*"],  # For development only
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
 app.include_router(disputes.router, prefix="/api/v1/disputes", tags=["disputes"])
 app.include_router(customers.router, prefix="/api/v1/customers", tags=["customers"])
+app.include_router(
+    analysis_jobs.router, prefix="/api/v1/analysis-jobs", tags=["analysis-jobs"]
+)
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
+app.include_router(snapshots.router, prefix="/api/v1/snapshots", tags=["snapshots"])
 
 
 # Create tables (for development)
 @app.on_event("startup")
 async def startup_event():
+    configure_db_threadpool()
     Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        ensure_dispute_stats(db)
+    finally:
+        db.close()
+    ai_service_pool.startup()
+    await analysis_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await analysis_queue.stop()
+    await ai_service_pool.shutdown()
 
 
 @app.get("/", tags=["root"])
@@ -38,4 +63,4 @@ async def read_root():
 
 @app.get("/health", tags=["health"])
 async def health_check():
-    return {"status": "OK"}
+    return {"status": "OK", "db_threadpool": db_threadpool_stats()}
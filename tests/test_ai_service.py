@@ -0,0 +1,406 @@
+# tests/test_ai_service.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.ai.circuit_breaker import CircuitBreaker, CircuitOpenError, LLMTimeoutError
+from app.ai.client_pool import AIServicePool
+from app.ai.fake_llm import FakeDisputeLLM
+from app.ai.langchain_service import DisputeAIService
+from app.ai.rate_limiter import AdaptiveRateLimiter
+from app.ai.response_cache import LLMResponseCache
+from app.ai.schemas.priority_schema import PrioritySchema
+from app.ai.schemas.insights_schema import InsightsSchema
+from app.ai.schemas.analysis_schema import CombinedAnalysisSchema
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(path=str(tmp_path / "llm_cache.db"))
+
+
+def test_ai_service_pool_reuses_services():
+    pool = AIServicePool(size=2)
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+
+    assert pool.started
+    assert first is third
+    assert first is not second
+    assert pool.acquire() is second
+
+    asyncio.run(pool.shutdown())
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.acquire()
+    pool.startup()
+    assert pool.acquire() is not first
+
+
+def test_aclose_closes_genai_clients_of_models_without_aclose():
+    closed = []
+
+    class Client:
+        def close(self):
+            closed.append("sync")
+
+    class AsyncClient:
+        async def aclose(self):
+            closed.append("async")
+
+    service = DisputeAIService(llm=FakeDisputeLLM())
+    service.llm = SimpleNamespace(client=Client(), async_client=AsyncClient())
+    asyncio.run(service.aclose())
+    assert closed == ["async", "sync"]
+
+
+def test_aanalyze_dispute_runs_calls_concurrently(cache):
+    async def fake_priority(_prompt):
+        await asyncio.sleep(0.2)
+        return PrioritySchema(priority_level=4, priority_reason="Large amount")
+
+    async def fake_insights(_prompt):
+        await asyncio.sleep(0.2)
+        return InsightsSchema(
+            insights="Looks like fraud",
+            followup_questions=["When?"],
+            probable_solutions=["Refund"],
+            possible_reasons=["Stolen card"],
+            risk_score=7,
+            risk_factors=["Amount"],
+        )
+
+    service = DisputeAIService(cache=cache)
+    service.priority_model = RunnableLambda(fake_priority)
+    service.insights_model = RunnableLambda(fake_insights)
+
+    result = asyncio.run(service.aanalyze_dispute({"category": "Fraud"}))
+
+    assert result["priority"] == 4
+    assert result["followup_questions"] == ["When?"]
+    timings = result["timings"]
+    assert timings["total_ms"] < timings["priority_ms"] + timings["insights_ms"]
+
+
+def test_combined_mode_makes_a_single_llm_call(cache):
+    calls = []
+
+    async def fake_combined(prompt):
+        calls.append(prompt)
+        return CombinedAnalysisSchema(
+            priority_level=3,
+            priority_reason="Moderate amount",
+            insights="Likely merchant error",
+            followup_questions=["Did you contact the merchant?"],
+            probable_solutions=["Chargeback"],
+            possible_reasons=["Duplicate billing"],
+            risk_score=4,
+            risk_factors=[],
+        )
+
+    service = DisputeAIService(mode="combined", cache=cache)
+    service.combined_model = RunnableLambda(fake_combined)
+
+    result = asyncio.run(service.aanalyze_dispute({"category": "Duplicate"}))
+
+    assert len(calls) == 1
+    assert result["priority"] == 3
+    assert result["insights"] == "Likely merchant error"
+    assert result["usage"]["mode"] == "combined"
+    assert result["usage"]["llm_calls"] == 1
+
+
+def test_response_cache_serves_repeat_analyses(cache):
+    calls = []
+
+    def fake_combined(prompt):
+        calls.append(prompt)
+        return CombinedAnalysisSchema(
+            priority_level=2,
+            priority_reason="Small amount",
+            insights="Routine",
+            followup_questions=[],
+            probable_solutions=[],
+            possible_reasons=[],
+            risk_score=1,
+            risk_factors=[],
+        )
+
+    service = DisputeAIService(mode="combined", cache=cache)
+    service.combined_model = RunnableLambda(fake_combined)
+
+    first = service.analyze_dispute({"category": "Other"})
+    second = service.analyze_dispute({"category": "Other"})
+
+    assert len(calls) == 1
+    assert second["priority"] == first["priority"]
+    assert second["usage"]["cache_hits"] == 1
+    assert second["usage"]["llm_calls"] == 0
+    assert cache.stats()["hits"] == 1
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "lru.db"), max_entries=2)
+    cache.set("a", {"value": 1})
+    cache.set("b", {"value": 2})
+    cache.get("a")
+    cache.set("c", {"value": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"value": 1}
+    assert cache.stats()["entries"] == 2
+
+
+def test_response_cache_hits_do_not_commit(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "touch.db"))
+    cache.set("a", {"value": 1})
+    changes = cache._conn.total_changes
+
+    assert cache.get("a") == {"value": 1}
+    assert cache._conn.total_changes == changes
+    assert not cache._conn.in_transaction
+
+
+def test_abatch_analyze_disputes_reports_per_item_failures(cache):
+    def fake_combined(prompt):
+        if "Broken" in prompt:
+            raise RuntimeError("LLM error")
+        return CombinedAnalysisSchema(
+            priority_level=1,
+            priority_reason="Low",
+            insights="Fine",
+            followup_questions=[],
+            probable_solutions=[],
+            possible_reasons=[],
+            risk_score=1,
+            risk_factors=[],
+        )
+
+    service = DisputeAIService(mode="combined", cache=cache)
+    service.combined_model = RunnableLambda(fake_combined)
+
+    results = asyncio.run(
+        service.abatch_analyze_disputes(
+            [{"category": "Fine"}, {"category": "Broken"}], max_concurrency=2
+        )
+    )
+
+    assert results[0]["priority"] == 1
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_rate_limiter_halves_concurrency_on_429():
+    limiter = AdaptiveRateLimiter(
+        requests_per_minute=600, tokens_per_minute=10**6, max_concurrency=4
+    )
+    fake_llm = GenericFakeChatModel(messages=iter([AIMessage(content="ok")] * 10))
+    limited = limiter.wrap(fake_llm)
+
+    assert limited.invoke("hello").content == "ok"
+
+    def quota_error(_prompt):
+        raise RuntimeError("429 RESOURCE_EXHAUSTED")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(limiter.wrap(RunnableLambda(quota_error)).ainvoke("hello"))
+
+    stats = limiter.stats()
+    assert stats["requests"] == 2
+    assert stats["rate_limited"] == 1
+    assert stats["concurrency_limit"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_rate_limiter_queues_when_bucket_is_empty():
+    limiter = AdaptiveRateLimiter(
+        requests_per_minute=1200, tokens_per_minute=10**6, max_concurrency=4
+    )
+    limiter._requests.tokens = 0
+
+    queued = limiter.acquire(estimated_tokens=10)
+    limiter.release(10, None, queued, 0.0)
+
+    # 1200 requests/min refills one request every 50ms
+    assert queued >= 0.04
+    assert limiter.stats()["max_queued_ms"] >= 40
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(
+        failure_threshold=2, recovery_seconds=0.05, timeout_seconds=0.05
+    )
+
+    async def slow(_prompt):
+        await asyncio.sleep(1)
+
+    guarded = breaker.wrap(RunnableLambda(slow))
+    for _ in range(2):
+        with pytest.raises(LLMTimeoutError):
+            asyncio.run(guarded.ainvoke("hello"))
+
+    # Open: rejected immediately without calling the model
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(guarded.ainvoke("hello"))
+    assert breaker.stats()["state"] == "open"
+
+    # After the recovery window a successful trial call closes the circuit
+    time.sleep(0.06)
+    assert breaker.wrap(RunnableLambda(lambda _prompt: "ok")).invoke("hello") == "ok"
+    assert breaker.stats()["state"] == "closed"
+
+
+def test_cancelled_half_open_trial_does_not_wedge_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.01)
+
+    async def fail(_prompt):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(breaker.wrap(RunnableLambda(fail)).ainvoke("hello"))
+    time.sleep(0.02)
+
+    async def cancel_trial():
+        async def hang(_prompt):
+            await asyncio.sleep(10)
+
+        trial = asyncio.create_task(breaker.wrap(RunnableLambda(hang)).ainvoke("hi"))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+    asyncio.run(cancel_trial())
+    assert breaker.wrap(RunnableLambda(lambda _prompt: "ok")).invoke("hello") == "ok"
+    assert breaker.stats()["state"] == "closed"
+
+
+def test_time_queued_in_the_rate_limiter_is_not_an_llm_timeout(cache):
+    limiter = AdaptiveRateLimiter(requests_per_minute=1200)
+    limiter._requests.tokens = 0  # every call waits ~50ms for a token
+    breaker = CircuitBreaker(failure_threshold=1, timeout_seconds=0.04)
+    service = DisputeAIService(
+        cache=cache,
+        rate_limiter=limiter,
+        circuit_breaker=breaker,
+        llm=FakeDisputeLLM(latency_ms=10),
+    )
+
+    async def burst():
+        return await asyncio.gather(
+            *(service.priority_model.ainvoke(f"prompt {i}") for i in range(3))
+        )
+
+    assert len(asyncio.run(burst())) == 3
+    assert breaker.stats()["state"] == "closed"
+    assert breaker.stats()["timeouts"] == 0
+
+
+
+def test_open_circuit_fails_before_queueing_in_the_rate_limiter(cache):
+    limiter = AdaptiveRateLimiter(requests_per_minute=60)
+    limiter._requests.tokens = 0  # the next token is a second away
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=60)
+    breaker.record_failure()
+    service = DisputeAIService(
+        cache=cache, rate_limiter=limiter, circuit_breaker=breaker, llm=FakeDisputeLLM()
+    )
+
+    started = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(service.priority_model.ainvoke("prompt"))
+    assert time.perf_counter() - started < 0.5
+    assert limiter.stats()["requests"] == 0
+
+
+def test_rate_limiter_refunds_the_estimate_of_a_failed_call():
+    limiter = AdaptiveRateLimiter(tokens_per_minute=10_000)
+
+    async def fail(_prompt):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(limiter.wrap(RunnableLambda(fail)).ainvoke("hello"))
+    assert limiter.stats()["available_tokens"] >= 10_000 - 1
+
+def test_fake_llm_returns_deterministic_schema_valid_analysis(cache):
+    dispute_data = {
+        "customer_name": "Jane",
+        "transaction_amount": 120.0,
+        "dispute_description": "Charged twice",
+        "category": "Duplicate",
+    }
+    service = DisputeAIService(cache=cache, llm=FakeDisputeLLM())
+    first = asyncio.run(service.aanalyze_dispute(dispute_data))
+
+    cache.clear()
+    second = DisputeAIService(cache=cache, llm=FakeDisputeLLM()).analyze_dispute(
+        dispute_data
+    )
+
+    assert 1 <= first["priority"] <= 5
+    assert first["followup_questions"]
+    assert first["usage"]["input_tokens"] > 0
+    assert second["priority"] == first["priority"]
+    assert second["insights"] == first["insights"]
+
+
+def test_fake_llm_injects_errors_and_latency():
+    failing = FakeDisputeLLM(error_rate=1.0).with_structured_output(PrioritySchema)
+    with pytest.raises(RuntimeError):
+        failing.invoke("prompt")
+
+    slow = FakeDisputeLLM(latency_ms=50).with_structured_output(PrioritySchema)
+    started = time.perf_counter()
+    asyncio.run(slow.ainvoke("prompt"))
+    assert time.perf_counter() - started >= 0.05
+
+
+def test_fake_llm_failures_and_latency_replay_with_the_seed():
+    from langchain_core.messages import HumanMessage
+
+    def profile(seed):
+        llm = FakeDisputeLLM(latency_ms=100, jitter_ms=50, error_rate=0.5, seed=seed)
+        # Three attempts at each prompt, as a retrying caller would make
+        return [
+            llm._call_profile([HumanMessage(content=f"prompt {i}")])
+            for i in range(20)
+            for _ in range(3)
+        ]
+
+    assert profile(7) == profile(7)
+    assert profile(7) != profile(8)
+    outcomes = {fail for _, fail in profile(7)}
+    assert outcomes == {True, False}
+
+
+def test_astream_analysis_streams_stages_before_the_result(cache):
+    dispute_data = {"customer_name": "Jane", "transaction_amount": 120.0}
+    service = DisputeAIService(
+        cache=cache,
+        rate_limiter=AdaptiveRateLimiter(),
+        circuit_breaker=CircuitBreaker(),
+        llm=FakeDisputeLLM(latency_ms=20),
+    )
+
+    async def collect():
+        return [event async for event in service.astream_analysis(dispute_data)]
+
+    events = asyncio.run(collect())
+    names = [name for name, _ in events]
+    assert names[-1] == "analysis"
+    assert names.count("priority") == 1
+    assert names.count("insights_token") > 1
+
+    analysis = events[-1][1]
+    streamed = "".join(d["text"] for n, d in events if n == "insights_token")
+    assert analysis["insights"] in streamed
+    assert analysis["usage"]["llm_calls"] == 2
+
+    # The streamed insights were cached like a regular call
+    repeat = asyncio.run(service.aanalyze_dispute(dispute_data))
+    assert repeat["usage"]["cache_hits"] == 2
+    assert repeat["insights"] == analysis["insights"]
+    assert service.rate_limiter.stats()["in_flight"] == 0
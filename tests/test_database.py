@@ -0,0 +1,220 @@
+# tests/test_database.py
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.api.database import (
+    Base,
+    Customer,
+    Dispute,
+    add_missing_columns,
+    create_db_engine,
+    create_missing_indexes,
+    deduplicate_insights,
+    migrate_insight_list_columns,
+    sqlite_pragmas,
+)
+from app.api.db_benchmark import run_benchmark
+from app.api.services.dispute_query import (
+    DisputeSort,
+    build_dispute_query,
+    dispute_sort_keys,
+)
+from app.api.services.pagination import next_cursor
+from app.core.config import settings
+
+
+def test_engine_applies_sqlite_profile_and_pool(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    with engine.connect() as connection:
+
+        def pragma(name):
+            return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert pragma("cache_size") == settings.SQLITE_CACHE_SIZE
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("foreign_keys") == 1
+
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    assert engine.pool._max_overflow == settings.DB_MAX_OVERFLOW
+    engine.dispose()
+
+
+def test_db_benchmark_reports_throughput_without_lock_errors():
+    result = run_benchmark(
+        "tuned", sqlite_pragmas(), readers=2, writers=2, seconds=0.5, rows=50
+    )
+    assert result["reads_per_s"] > 0
+    assert result["writes_per_s"] > 0
+    assert result["read_errors"] == result["write_errors"] == 0
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _query_plan(db, query) -> str:
+    sql = query.statement.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_dispute_list_queries_use_composite_indexes(session):
+    plan = _query_plan(session, build_dispute_query(session).limit(100))
+    assert "USING INDEX ix_disputes_priority_sort_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+    plan = _query_plan(session, build_dispute_query(session, status="Open").limit(100))
+    assert "USING INDEX ix_disputes_status_priority_sort_created (status=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+    plan = _query_plan(session, build_dispute_query(session, priority=4).limit(100))
+    assert "USING INDEX ix_disputes_priority_created (priority=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+    by_amount = build_dispute_query(session, sort=DisputeSort.amount).limit(100)
+    plan = _query_plan(session, by_amount)
+    assert "USING INDEX ix_disputes_amount_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+    customer_disputes = (
+        session.query(Dispute)
+        .filter(Dispute.customer_id == "c1")
+        .order_by(Dispute.created_at.desc())
+    )
+    plan = _query_plan(session, customer_disputes)
+    assert "USING INDEX ix_disputes_customer_created (customer_id=?)" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_priority_sort_treats_missing_priority_as_lowest(session):
+    session.add(Customer(id="c1", name="A", email="a@example.com"))
+    for dispute_id, priority in [("low", 1), ("none", None), ("high", 5)]:
+        session.add(Dispute(id=dispute_id, customer_id="c1", priority=priority))
+    session.commit()
+
+    ordered = [d.id for d in build_dispute_query(session)]
+    assert ordered == ["high", "low", "none"]
+    assert session.get(Dispute, "none").priority_sort == 0
+
+
+def test_existing_database_gets_indexes_and_explicit_insight_dedupe(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        # Schema as created before the sort key and indexes were added
+        connection.execute(
+            text(
+                "CREATE TABLE disputes (id VARCHAR PRIMARY KEY, customer_id VARCHAR, "
+                "status VARCHAR, priority INTEGER, created_at DATETIME)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE TABLE dispute_insights (id VARCHAR PRIMARY KEY, "
+                "dispute_id VARCHAR NOT NULL, insights VARCHAR, "
+                "created_at DATETIME, updated_at DATETIME)"
+            )
+        )
+        connection.execute(text("INSERT INTO disputes (id) VALUES ('d1')"))
+        connection.execute(
+            text(
+                "INSERT INTO dispute_insights VALUES "
+                "('old', 'd1', 'stale', NULL, NULL), "
+                "('new', 'd1', 'latest', NULL, NULL)"
+            )
+        )
+
+    add_missing_columns(engine)
+    create_missing_indexes(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("disputes")}
+    assert "ix_disputes_status_priority_sort_created" in indexes
+    # Duplicates are kept, and the unique index waits, until deduplication
+    # is asked for explicitly
+    def insight_indexes():
+        return {i["name"] for i in inspect(engine).get_indexes("dispute_insights")}
+
+    assert "ix_dispute_insights_dispute_id" not in insight_indexes()
+
+    assert deduplicate_insights(engine) == 1
+    create_missing_indexes(engine)
+    assert "ix_dispute_insights_dispute_id" in insight_indexes()
+    with engine.connect() as connection:
+        assert connection.execute(
+            text("SELECT id FROM dispute_insights")
+        ).fetchall() == [("new",)]
+        assert connection.execute(
+            text("SELECT priority_sort FROM disputes")
+        ).scalar() == 0
+    engine.dispose()
+
+
+def test_cursor_pages_are_index_range_scans(session):
+    session.add(Customer(id="c1", name="A", email="a@example.com"))
+    for i in range(5):
+        session.add(Dispute(id=f"d{i}", customer_id="c1", priority=i % 2 + 1))
+    session.commit()
+
+    first = build_dispute_query(session).limit(2).all()
+    cursor = next_cursor(first, dispute_sort_keys(), 2)
+    query = build_dispute_query(session, cursor=cursor).limit(2)
+
+    plan = _query_plan(session, query)
+    assert "SEARCH disputes USING INDEX ix_disputes_priority_sort_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+    # Ascending dates mix directions and fall back to an OR condition
+    everything = [d.id for d in build_dispute_query(session, date_sort="asc")]
+    first = build_dispute_query(session, date_sort="asc").limit(2).all()
+    cursor = next_cursor(first, dispute_sort_keys(date_sort="asc"), 2)
+    rest = build_dispute_query(session, date_sort="asc", cursor=cursor).all()
+    assert [d.id for d in first + rest] == everything
+
+
+def test_insight_list_strings_are_migrated_to_json_arrays(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        columns = ", ".join(
+            f"{name} VARCHAR"
+            for name in (
+                "followup_questions",
+                "probable_solutions",
+                "possible_reasons",
+                "risk_factors",
+            )
+        )
+        connection.execute(
+            text(f"CREATE TABLE dispute_insights (id VARCHAR PRIMARY KEY, {columns})")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO dispute_insights VALUES "
+                """('json', '["a"]', '[]', '["b", "c"]', '["High amount"]'), """
+                """('repr', '[''a'']', '', 'not a list', '"one"')"""
+            )
+        )
+
+    assert migrate_insight_list_columns(engine) == 4
+    assert migrate_insight_list_columns(engine) == 0
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT * FROM dispute_insights ORDER BY id")
+        ).fetchall()
+    assert rows == [
+        ("json", '["a"]', "[]", '["b", "c"]', '["High amount"]'),
+        ("repr", '["a"]', "[]", '["not a list"]', '["one"]'),
+    ]
+    engine.dispose()
@@ -1,10 +1,22 @@
 # tests/test_endpoints.py
+import asyncio
+import inspect
+import json
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.api.database import Base, get_db
+from app.api.database import Base, DisputeInsight, get_db
+from app.api.routes import analysis_jobs, customers, disputes
+from app.api.routes.disputes import get_ai_service
+from app.ai.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.ai.fake_llm import FakeDisputeLLM
+from app.ai.langchain_service import DisputeAIService
+from app.ai.rate_limiter import AdaptiveRateLimiter
+from app.ai.response_cache import LLMResponseCache
+from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -26,15 +38,26 @@ def db_session():
 
 
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, tmp_path):
     def override_get_db():
         try:
             yield db_session
         finally:
             db_session.close()
 
+    # Analyze with the deterministic offline backend instead of Gemini, with
+    # its own cache, limiter and breaker so tests don't share process state
+    fake_ai_service = DisputeAIService(
+        llm=FakeDisputeLLM(),
+        cache=LLMResponseCache(path=str(tmp_path / "llm_cache.db")),
+        rate_limiter=AdaptiveRateLimiter(),
+        circuit_breaker=CircuitBreaker(),
+    )
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_ai_service] = lambda: fake_ai_service
     yield TestClient(app)
+    app.dependency_overrides.clear()
 
 
 def test_health_check(client):
@@ -84,3 +107,627 @@ def test_full_dispute_flow(client):
     assert response.status_code == 200
     # response = client.delete(f"/api/v1/customers/{customer_id}")
     # assert response.status_code == 200
+
+
+def _create_customer_and_dispute(client, email="jobs@example.com"):
+    customer = {"name": "Job User", "email": email, "account_type": "Individual"}
+    customer_id = client.post("/api/v1/customers/", json=customer).json()["id"]
+    dispute = {
+        "customer_id": customer_id,
+        "transaction_id": "TX999",
+        "merchant_name": "Test Merchant",
+        "amount": 250.0,
+        "description": "Charged twice",
+        "category": "Duplicate",
+    }
+    return client.post("/api/v1/disputes/", json=dispute).json()["id"]
+
+
+def test_background_analysis_returns_job(client):
+    dispute_id = _create_customer_and_dispute(client)
+
+    response = client.post(f"/api/v1/disputes/{dispute_id}/analyze?background=true")
+    assert response.status_code == 202
+    job = response.json()
+    assert job["dispute_id"] == dispute_id
+    assert job["status"] == "queued"
+
+    response = client.get(f"/api/v1/analysis-jobs/{job['id']}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+
+    assert client.get("/api/v1/analysis-jobs/missing").status_code == 404
+
+
+def test_analysis_queue_worker_completes_job(client, db_session, monkeypatch):
+    from app.api.services import analysis_queue as queue_module
+
+    class StubAIService:
+        async def aanalyze_dispute(self, dispute_data):
+            return {
+                "priority": 2,
+                "priority_reason": "Small amount",
+                "insights": "Duplicate charge",
+                "followup_questions": [],
+                "probable_solutions": ["Refund"],
+                "possible_reasons": [],
+                "risk_score": 2,
+                "risk_factors": [],
+            }
+
+    monkeypatch.setattr(queue_module.ai_service_pool, "acquire", StubAIService)
+    dispute_id = _create_customer_and_dispute(client, email="worker@example.com")
+    queue = queue_module.AnalysisJobQueue(
+        workers=1, session_factory=TestingSessionLocal
+    )
+
+    async def run():
+        # Job is persisted before the workers start, as after a restart
+        job_id = queue.create_job(db_session, dispute_id).id
+        await queue.start()
+        await queue._queue.join()
+        await queue.stop()
+        return job_id
+
+    job_id = asyncio.run(run())
+
+    job = client.get(f"/api/v1/analysis-jobs/{job_id}").json()
+    assert job["status"] == "completed"
+    assert job["result"]["priority"] == 2
+    assert client.get(f"/api/v1/disputes/{dispute_id}").json()["priority"] == 2
+
+
+def test_analyze_batch_streams_progress(client):
+    class StubAIService:
+        async def abatch_analyze_disputes(self, disputes, max_concurrency):
+            return [
+                {
+                    "priority": 3,
+                    "priority_reason": "Batch",
+                    "insights": "Batch insight",
+                    "followup_questions": [],
+                    "probable_solutions": [],
+                    "possible_reasons": [],
+                    "risk_score": 5,
+                    "risk_factors": [],
+                }
+                for _ in disputes
+            ]
+
+    app.dependency_overrides[get_ai_service] = StubAIService
+    try:
+        first = _create_customer_and_dispute(client, email="batch1@example.com")
+        second = _create_customer_and_dispute(client, email="batch2@example.com")
+
+        response = client.post("/api/v1/disputes/analyze-batch?batch_size=1")
+        assert response.status_code == 200
+        events = [json.loads(line) for line in response.text.splitlines()]
+    finally:
+        del app.dependency_overrides[get_ai_service]
+
+    assert events[0] == {"event": "started", "total": 2}
+    assert [e["processed"] for e in events if e["event"] == "progress"] == [1, 2]
+    assert events[-1]["succeeded"] == 2
+    for dispute_id in (first, second):
+        assert client.get(f"/api/v1/disputes/{dispute_id}/insights").status_code == 200
+
+
+def test_analyze_batch_reloads_rows_once_per_batch(client):
+    class StubAIService:
+        async def abatch_analyze_disputes(self, disputes, max_concurrency):
+            return [
+                {
+                    "priority": 3,
+                    "priority_reason": "Batch",
+                    "insights": "Batch insight",
+                    "followup_questions": [],
+                    "probable_solutions": [],
+                    "possible_reasons": [],
+                    "risk_score": 5,
+                    "risk_factors": [],
+                }
+                for _ in disputes
+            ]
+
+    for i in range(6):
+        _create_customer_and_dispute(client, email=f"reload{i}@example.com")
+
+    selects = []
+
+    def record_select(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    app.dependency_overrides[get_ai_service] = StubAIService
+    event.listen(engine, "before_cursor_execute", record_select)
+    try:
+        response = client.post("/api/v1/disputes/analyze-batch?batch_size=2")
+    finally:
+        event.remove(engine, "before_cursor_execute", record_select)
+        del app.dependency_overrides[get_ai_service]
+
+    assert json.loads(response.text.splitlines()[-1])["succeeded"] == 6
+    # The pending listing plus one joined reload per batch, no lazy loads
+    assert len(selects) == 1 + 3
+
+
+def test_analysis_falls_back_while_circuit_is_open(client):
+    class OpenCircuitAIService:
+        async def aanalyze_dispute(self, dispute_data):
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+    class HealthyAIService:
+        async def aanalyze_dispute(self, dispute_data):
+            return {
+                "priority": 5,
+                "priority_reason": "AI",
+                "insights": "Full AI insight",
+                "followup_questions": ["Q"],
+                "probable_solutions": [],
+                "possible_reasons": [],
+                "risk_score": 9,
+                "risk_factors": [],
+            }
+
+    dispute_id = _create_customer_and_dispute(client, email="breaker@example.com")
+
+    app.dependency_overrides[get_ai_service] = OpenCircuitAIService
+    try:
+        response = client.post(f"/api/v1/disputes/{dispute_id}/analyze")
+    finally:
+        del app.dependency_overrides[get_ai_service]
+    assert response.status_code == 201
+    analysis = response.json()["analysis"]
+    assert analysis["provisional"] is True
+    assert 1 <= analysis["priority"] <= 5
+    insights = client.get(f"/api/v1/disputes/{dispute_id}/insights").json()
+    assert insights["is_provisional"] is True
+
+    # Re-analysis upgrades the provisional insight once the LLM is back
+    app.dependency_overrides[get_ai_service] = HealthyAIService
+    try:
+        response = client.post(f"/api/v1/disputes/{dispute_id}/analyze")
+    finally:
+        del app.dependency_overrides[get_ai_service]
+    assert response.json()["analysis"]["insights"] == "Full AI insight"
+    insights = client.get(f"/api/v1/disputes/{dispute_id}/insights").json()
+    assert insights["is_provisional"] is False
+    assert insights["priority_level"] == 5
+
+
+def test_analysis_stream_sends_events_and_stores_insight(client):
+    dispute_id = _create_customer_and_dispute(client, email="stream@example.com")
+
+    response = client.get(f"/api/v1/disputes/{dispute_id}/analyze/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        data = json.loads(data_line[len("data: ") :])
+        events.append((event_line[len("event: ") :], data))
+
+    names = [name for name, _ in events]
+    assert names[0] == "risk"
+    assert "priority" in names and "insights_token" in names
+    assert names[-1] == "analysis"
+
+    insights = client.get(f"/api/v1/disputes/{dispute_id}/insights").json()
+    assert insights["insights"] == events[-1][1]["insights"]
+    assert insights["is_provisional"] is False
+
+    missing = client.get("/api/v1/disputes/missing/analyze/stream")
+    assert missing.status_code == 404
+
+
+def test_database_routes_do_not_block_the_event_loop(client):
+    # Async handlers may only touch the database through run_in_threadpool;
+    # everything else must be a sync route so FastAPI runs it on the pool
+    async_db_routes = {
+        route.endpoint.__name__
+        for router in (disputes.router, customers.router, analysis_jobs.router)
+        for route in router.routes
+        if inspect.iscoroutinefunction(route.endpoint)
+        and any(dep.call is get_db for dep in route.dependant.dependencies)
+    }
+    assert async_db_routes == {
+        "bulk_create_customers",
+        "bulk_create_disputes",
+        "analyze_disputes_batch",
+        "analyze_dispute",
+        "stream_dispute_analysis",
+    }
+
+    with client:
+        pool = client.get("/health").json()["db_threadpool"]
+    assert pool["size"] == settings.DB_THREADPOOL_SIZE
+    assert pool["queued"] == 0
+
+
+def test_cursor_pagination_survives_inserts_mid_scroll(client):
+    first_ids = {
+        _create_customer_and_dispute(client, f"page{i}@example.com") for i in range(3)
+    }
+
+    response = client.get("/api/v1/disputes/?limit=2")
+    page_one = [d["id"] for d in response.json()]
+    cursor = response.headers["X-Next-Cursor"]
+
+    # A newer dispute arriving mid-scroll must not shift the next page
+    _create_customer_and_dispute(client, "late@example.com")
+
+    response = client.get(f"/api/v1/disputes/?limit=2&cursor={cursor}")
+    page_two = [d["id"] for d in response.json()]
+    assert "X-Next-Cursor" not in response.headers
+    assert set(page_one + page_two) == first_ids
+    assert len(page_one + page_two) == 3
+
+    # A cursor only applies to the sort order it was issued for
+    response = client.get(f"/api/v1/disputes/?date_sort=asc&cursor={cursor}")
+    assert response.status_code == 400
+    assert client.get("/api/v1/disputes/?cursor=garbage").status_code == 400
+
+    response = client.get("/api/v1/customers/?limit=3")
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(f"/api/v1/customers/?limit=3&cursor={cursor}")
+    assert [c["email"] for c in response.json()] == ["late@example.com"]
+
+
+def test_dashboard_metrics_are_aggregated_server_side(client, db_session):
+    first = _create_customer_and_dispute(client, "metrics1@example.com")
+    second = _create_customer_and_dispute(client, "metrics2@example.com")
+    _create_customer_and_dispute(client, "metrics3@example.com")
+    client.put(f"/api/v1/disputes/{first}", json={"priority": 5})
+    client.put(f"/api/v1/disputes/{second}", json={"status": "Resolved", "priority": 2})
+
+    metrics = client.get("/api/v1/metrics/dashboard").json()
+    assert metrics["total_disputes"] == 3
+    assert metrics["high_priority_count"] == 1
+    assert metrics["pending_count"] == 2
+    assert metrics["resolved_today"] == 1
+    assert metrics["disputes_by_status"] == {"Open": 2, "Resolved": 1}
+    assert metrics["disputes_by_priority"] == {"5": 1, "2": 1}
+    assert metrics["disputes_by_category"] == {"Duplicate": 3}
+    assert metrics["average_resolution_time"].endswith("h")
+
+
+def test_dispute_stats_track_writes_and_rebuild(client, db_session):
+    from app.api.database import DisputeStat
+    from app.api.services.dispute_stats import (
+        check_dispute_stats,
+        rebuild_dispute_stats,
+    )
+
+    first = _create_customer_and_dispute(client, "stats1@example.com")
+    second = _create_customer_and_dispute(client, "stats2@example.com")
+    client.put(f"/api/v1/disputes/{first}", json={"status": "Resolved", "priority": 4})
+    client.post(f"/api/v1/disputes/{second}/analyze")
+    client.delete(f"/api/v1/disputes/{first}")
+
+    assert check_dispute_stats(db_session) == []
+    served = client.get("/api/v1/metrics/dashboard").json()
+    assert served["total_disputes"] == 1
+    assert served["resolved_today"] == 0
+    assert served["disputes_by_category"] == {"Duplicate": 1}
+
+    db_session.query(DisputeStat).filter(DisputeStat.dimension == "total").update(
+        {"count": 7}
+    )
+    db_session.commit()
+    assert check_dispute_stats(db_session)[0]["expected"][0] == 1
+
+    rebuild_dispute_stats(db_session)
+    assert check_dispute_stats(db_session) == []
+
+
+def test_dispute_listing_filters_and_sorts_server_side(client):
+    ids = [
+        _create_customer_and_dispute(client, f"filter{i}@example.com") for i in range(4)
+    ]
+    updates = [
+        {"status": "Info Requested", "priority": 5},
+        {"status": "Approved", "priority": 4},
+        {"status": "Rejected", "priority": 1},
+        {"priority": 4},
+    ]
+    for dispute_id, update in zip(ids, updates):
+        response = client.put(f"/api/v1/disputes/{dispute_id}", json=update)
+        assert response.status_code == 200
+
+    def listed(query):
+        response = client.get(f"/api/v1/disputes/?{query}")
+        assert response.status_code == 200
+        return [d["id"] for d in response.json()]
+
+    assert listed("status=Info Requested&status=Approved") == ids[:2]
+    assert listed("priority=4,5&sort=oldest") == [ids[0], ids[1], ids[3]]
+    assert listed("priority=4&status=Open") == [ids[3]]
+    assert listed("category=Duplicate,Fraud&sort=newest") == ids[::-1]
+    assert listed("min_amount=100&max_amount=300") == listed("sort=priority")
+    assert listed("min_amount=300") == []
+    assert listed("created_from=2000-01-01T00:00:00&created_to=2000-12-31") == []
+
+    assert client.get("/api/v1/disputes/?status=Closed").status_code == 400
+    assert client.get("/api/v1/disputes/?priority=9").status_code == 400
+    assert client.get("/api/v1/disputes/?sort=random").status_code == 422
+    assert client.get("/api/v1/disputes/?min_amount=5&max_amount=1").status_code == 400
+
+
+def test_full_dispute_is_loaded_in_one_query(client, db_session):
+    from sqlalchemy import event
+
+    from app.api.database import DisputeNote
+
+    dispute_id = _create_customer_and_dispute(client, "full@example.com")
+    client.post(f"/api/v1/disputes/{dispute_id}/analyze")
+    db_session.add(DisputeNote(id="n1", dispute_id=dispute_id, content="Called"))
+    db_session.commit()
+    db_session.expunge_all()
+
+    statements = []
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_selects)
+    try:
+        response = client.get(f"/api/v1/disputes/{dispute_id}/full")
+    finally:
+        event.remove(engine, "before_cursor_execute", count_selects)
+
+    assert response.status_code == 200
+    full = response.json()
+    assert full["customer"]["email"] == "full@example.com"
+    assert full["insights"]["dispute_id"] == dispute_id
+    assert [note["content"] for note in full["notes"]] == ["Called"]
+    assert len(statements) == 1
+
+    assert client.get("/api/v1/disputes/missing/full").status_code == 404
+
+
+def test_dispute_listing_expands_customers_without_n_plus_one(client, db_session):
+    from sqlalchemy import event
+
+    for i in range(4):
+        _create_customer_and_dispute(client, f"expand{i}@example.com")
+    db_session.expunge_all()
+
+    statements = []
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_selects)
+    try:
+        response = client.get("/api/v1/disputes/?expand=customer")
+    finally:
+        event.remove(engine, "before_cursor_execute", count_selects)
+
+    assert response.status_code == 200
+    emails = {d["customer"]["email"] for d in response.json()}
+    assert emails == {f"expand{i}@example.com" for i in range(4)}
+    assert len(statements) == 2
+
+    plain = client.get("/api/v1/disputes/").json()
+    assert all("customer" not in d for d in plain)
+    assert client.get("/api/v1/disputes/?expand=notes").status_code == 400
+
+
+def test_bulk_ingestion_reports_each_row(client, db_session, monkeypatch):
+    from app.api.services.dispute_stats import check_dispute_stats
+
+    monkeypatch.setattr(settings, "BULK_CHUNK_SIZE", 2)
+    customers = [
+        {"name": "Bulk A", "email": "bulk-a@example.com"},
+        {"name": "Bulk B", "email": "bulk-b@example.com"},
+        {"name": "Dup", "email": "bulk-a@example.com"},
+        {"name": "No email"},
+    ]
+    report = client.post("/api/v1/customers/bulk", json=customers).json()
+    assert (report["total"], report["created"], report["failed"]) == (4, 2, 2)
+    assert [r["status"] for r in report["results"]] == [
+        "created",
+        "created",
+        "error",
+        "error",
+    ]
+    first, second = (r["id"] for r in report["results"][:2])
+
+    dispute = {
+        "transaction_id": "TXB",
+        "merchant_name": "Bulk Merchant",
+        "amount": 10.0,
+        "description": "Feed row",
+        "category": "Fraud",
+    }
+    lines = [
+        json.dumps({**dispute, "customer_id": first}),
+        json.dumps({**dispute, "customer_id": first}),
+        "{not json",
+        json.dumps({**dispute, "customer_id": "missing"}),
+        json.dumps({**dispute, "customer_id": second}),
+    ]
+    response = client.post(
+        "/api/v1/disputes/bulk",
+        content="\n".join(lines) + "\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    report = response.json()
+    assert (report["total"], report["created"], report["failed"]) == (5, 3, 2)
+    assert report["results"][2]["error"].startswith("Invalid JSON")
+    assert report["results"][3]["error"] == "Customer not found"
+
+    assert client.get(f"/api/v1/customers/{first}").json()["dispute_count"] == 2
+    assert client.get(f"/api/v1/customers/{second}").json()["dispute_count"] == 1
+    assert check_dispute_stats(db_session) == []
+
+    assert client.post("/api/v1/disputes/bulk", json={"a": 1}).status_code == 400
+
+
+def test_export_streams_filtered_disputes_with_insights(client):
+    import csv
+    import io
+
+    ids = [
+        _create_customer_and_dispute(client, f"export{i}@example.com") for i in range(3)
+    ]
+    client.put(f"/api/v1/disputes/{ids[0]}", json={"status": "Resolved"})
+    client.post(f"/api/v1/disputes/{ids[1]}/analyze")
+
+    response = client.get("/api/v1/disputes/export?status=Open&include_insights=true")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert {row["id"] for row in rows} == set(ids[1:])
+    analyzed = next(row for row in rows if row["id"] == ids[1])
+    assert isinstance(analyzed["insight_followup_questions"], list)
+    unanalyzed = next(row for row in rows if row["id"] == ids[2])
+    assert unanalyzed["insight_risk_score"] is None
+
+    response = client.get("/api/v1/disputes/export?format=csv&sort=oldest")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == ids
+    assert "insight_risk_score" not in rows[0]
+
+    assert client.get("/api/v1/disputes/export?status=Closed").status_code == 400
+
+
+def test_snapshots_are_columnar_with_decoded_insight_lists(client, tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from app.api.services.snapshot_export import SnapshotFormat, write_snapshot
+
+    ids = [
+        _create_customer_and_dispute(client, f"snap{i}@example.com") for i in range(3)
+    ]
+    client.post(f"/api/v1/disputes/{ids[0]}/analyze")
+
+    response = client.get("/api/v1/snapshots/disputes")
+    assert response.status_code == 200
+    disputes = pq.read_table(pa.BufferReader(response.content))
+    assert sorted(disputes.column("id").to_pylist()) == sorted(ids)
+    assert disputes.schema.field("created_at").type == pa.timestamp("us")
+    assert "priority_sort" not in disputes.schema.names
+
+    response = client.get("/api/v1/snapshots/dispute_insights?format=arrow")
+    insights = pa.ipc.open_file(pa.BufferReader(response.content)).read_all()
+    assert insights.schema.field("risk_factors").type == pa.list_(pa.string())
+    assert insights.column("dispute_id").to_pylist() == [ids[0]]
+    assert isinstance(insights.column("followup_questions")[0].as_py(), list)
+
+    db = TestingSessionLocal()
+    try:
+        path = tmp_path / "customers.parquet"
+        rows = write_snapshot(db, "customers", str(path), SnapshotFormat.parquet, 2)
+    finally:
+        db.close()
+    customers = pq.ParquetFile(path)
+    assert rows == 3
+    assert customers.metadata.num_row_groups == 2
+
+    assert client.get("/api/v1/snapshots/secrets").status_code == 404
+
+
+def test_insight_lists_are_stored_as_json_and_filterable(client):
+    ids = [
+        _create_customer_and_dispute(client, f"risk{i}@example.com") for i in range(3)
+    ]
+    risk_factors = [["New account", "High amount, foreign"], ["New account"], []]
+    for dispute_id, factors in zip(ids, risk_factors):
+        insight = {
+            "insights": "Looks risky",
+            "followup_questions": ["When?"],
+            "probable_solutions": [],
+            "possible_reasons": ["Fraud"],
+            "risk_score": 5.0,
+            "risk_factors": factors,
+            "priority_level": 3,
+            "priority_reason": "Test",
+        }
+        response = client.post(f"/api/v1/disputes/{dispute_id}/insights", json=insight)
+        assert response.json()["risk_factors"] == factors
+
+    db = TestingSessionLocal()
+    try:
+        stored = db.query(DisputeInsight).filter_by(dispute_id=ids[0]).one()
+        assert stored.risk_factors == ["New account", "High amount, foreign"]
+    finally:
+        db.close()
+
+    def listed(query):
+        return {d["id"] for d in client.get(f"/api/v1/disputes/?{query}").json()}
+
+    assert listed("risk_factor=New account") == set(ids[:2])
+    assert listed("risk_factor=High amount, foreign") == {ids[0]}
+    assert listed("risk_factor=Unknown") == set()
+    exported = client.get("/api/v1/disputes/export?risk_factor=High amount, foreign")
+    assert [json.loads(line)["id"] for line in exported.text.splitlines()] == [ids[0]]
+
+
+def test_concurrent_analyses_update_the_same_insight(client):
+    from app.api.services.analysis_service import (
+        get_analysis_context,
+        rule_based_analysis,
+        save_analysis,
+    )
+
+    dispute_id = _create_customer_and_dispute(client, "race@example.com")
+    first, second = TestingSessionLocal(), TestingSessionLocal()
+    try:
+        # Both sessions saw no insight before either stored one
+        contexts = [get_analysis_context(db, dispute_id) for db in (first, second)]
+        analysis = rule_based_analysis({"transaction_amount": 20000.0})
+        save_analysis(first, contexts[0][0], analysis)
+
+        analysis = {**analysis, "insights": "Second analysis", "provisional": False}
+        save_analysis(second, contexts[1][0], analysis, contexts[1][2])
+
+        stored = second.query(DisputeInsight).filter_by(dispute_id=dispute_id).all()
+        assert [insight.insights for insight in stored] == ["Second analysis"]
+        assert stored[0].is_provisional is False
+    finally:
+        first.close()
+        second.close()
+
+
+def test_failed_batch_commit_reports_every_dispute(client, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+
+    from app.api.services.analysis_service import (
+        build_dispute_data,
+        rule_based_analysis,
+    )
+    from app.api.services.batch_analysis import (
+        get_unanalyzed_disputes,
+        store_batch_results,
+    )
+
+    ids = {
+        _create_customer_and_dispute(client, f"commit{i}@example.com")
+        for i in range(2)
+    }
+    db = TestingSessionLocal()
+    try:
+        batch = [row for row in get_unanalyzed_disputes(db) if row[0].id in ids]
+        data = [build_dispute_data(dispute, customer) for dispute, customer, _ in batch]
+        results = [rule_based_analysis(item) for item in data]
+
+        def failing_commit():
+            raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+        monkeypatch.setattr(db, "commit", failing_commit)
+        failures = []
+        assert store_batch_results(db, batch, data, results, failures) == 0
+        assert {failure["dispute_id"] for failure in failures} == ids
+
+        # The session was rolled back and is still usable
+        assert db.query(DisputeInsight).filter(
+            DisputeInsight.dispute_id.in_(ids)
+        ).count() == 0
+    finally:
+        db.close()